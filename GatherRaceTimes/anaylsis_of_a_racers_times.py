@@ -134,18 +134,27 @@ def get_racer_times(filename, racer_name):
         if racer_name not in reader.fieldnames:
             print("Racer name not found")
             return []
-        
-        times = []
+        return [parse_lap_time(row[racer_name]) for row in reader]
+
+# Blank or unreadable cells are laps with no time
+def parse_lap_time(time_str):
+    if not time_str:
+        return None
+    try:
+        return float(time_str.strip())
+    except ValueError:
+        return None
+
+# 1b. Every racer's times from one read of the CSV: {racer: [times]}, in column order
+def get_field_times(filename):
+    with open(filename, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        racers = [name for name in reader.fieldnames if name != 'Lap']
+        field = {racer: [] for racer in racers}
         for row in reader:
-            time_str = row[racer_name]
-            if not time_str:
-                times.append(None)
-            else:
-                try:
-                    times.append(float(time_str.strip()))
-                except ValueError:
-                    times.append(None)
-        return times
+            for racer in racers:
+                field[racer].append(parse_lap_time(row[racer]))
+        return field
 
 # 2. Time Delta Analysis (Delta From Prev Lap)
 def pre_lap_deltas(times):
@@ -280,7 +289,8 @@ def analyze_lap_times(filename, racer_name):
         # statistical_analysis(times)
 
 # Running the analysis
-analyze_lap_times('outputFiles\lap_times1.csv', 'EpicX18 GT9')
+if __name__ == "__main__":
+    analyze_lap_times('outputFiles\lap_times1.csv', 'EpicX18 GT9')
 
 
 
@@ -1,15 +1,20 @@
 import os
 import subprocess
+import tempfile
+import time
 import cv2
 import numpy as np
 import math
-from PIL import ImageFont, ImageDraw, Image
+from PIL import ImageDraw, Image
 from tqdm import tqdm
 
 # Config
 WIDTH = 1920
 HEIGHT = 120
 FPS = 59.94
+USE_GPU = True
+SEGMENT_BACKEND = "composite"  # "composite": bar + playhead drawn in memory into one encoder,
+                               # "filtergraph": ffmpeg draws the playhead from an expression, "overlay": bar/dot files + ffmpeg colorkey
 OUTPUT_DIR = "SegmentOverlayFiles(MM-DD-YY)"
 
 """
@@ -21,9 +26,6 @@ python -m MakeSegmentOverlay.SegmentOverlay_v0
 BAR_FILE = "bar_overlay.mp4"
 DOT_FILE = "dot_overlay.mp4"
 DOT_AVI_FILE = "dot_overlay.avi"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-BAR_OVERLAY = f"{OUTPUT_DIR}/{BAR_FILE}"
-DOT_OVERLAY = f"{OUTPUT_DIR}/{DOT_FILE}"
 SEGMENT_OVERLAY = f"{OUTPUT_DIR}/Segment_Overlay_(6-20-25)-R2.mp4"
 
 # ffmpeg exe path if needed
@@ -32,67 +34,78 @@ FFMPEG_BIN = "ffmpeg"  # Change if you need an absolute path
 
 
 END_DURATION = 15  # seconds hold last frame
+CHECK_ALIGNMENT = True  # verify playhead vs bar segments for every frame before rendering (milliseconds)
 FONT_PATH = "C:\\Users\\epics\\AppData\\Local\\Microsoft\\Windows\\Fonts\\NIS-Heisei-Mincho-W9-Condensed.TTF"
 FONT_SIZE = 24
-FONT = ImageFont.truetype(FONT_PATH, FONT_SIZE)
 
 # Lap times
 import sys
 sys.path.append("F:/_Small/344 School Python/TrackFootageEditor")
-from GatherRaceTimes.anaylsis_of_a_racers_times import get_racer_times
+from OverlayShared.overlay_config import apply_overrides, load_font, racer_lap_times
+from OverlayShared.ffmpeg_pipe import FFmpegPipeWriter, get_encoder_opts, write_timeline_list
 
-LAP_TIMES = get_racer_times("F:\\_Small\\344 School Python\\TrackFootageEditor\\RaceStorage\\(6-20-25)-R2\\lap_times(6-20-25)-R2.csv", "EpicX18 GT9")
+RACE_CSV = "F:\\_Small\\344 School Python\\TrackFootageEditor\\RaceStorage\\(6-20-25)-R2\\lap_times(6-20-25)-R2.csv"
+RACER = "EpicX18 GT9"
 
+# Nothing is read or rendered at import, load_race() / get_font() / main() do that
+LAP_TIMES = []
+FONT = None
 
+_config_overrides = {}
+def configure(**overrides):
+    """
+    Overrides config constants by name, e.g. configure(FPS=30, USE_GPU=False).
+    """
+    apply_overrides(globals(), overrides, _config_overrides)
 
+def load_race(csv_path=None, racer=None):
+    global LAP_TIMES
+    LAP_TIMES = racer_lap_times(csv_path or RACE_CSV, racer or RACER)
+    return LAP_TIMES
 
-def test_alignment():
-    total_time = sum(LAP_TIMES)
-    segment_length = [ (lap / total_time) * WIDTH for lap in LAP_TIMES ]
-    lap_cumulative_times = np.cumsum(LAP_TIMES)
-    total_time = sum(LAP_TIMES)
-    frame_count = int(FPS * total_time)
-    errors = 0
+def get_font():
+    # FONT can be set directly to use an already loaded font
+    return FONT if FONT is not None else load_font(FONT_PATH, FONT_SIZE)
 
-    for frame_idx in range(frame_count):
-        current_time_sec = frame_idx / FPS
 
-        # Determine which lap segment the current time is in
-        lap_done_idx = np.searchsorted(lap_cumulative_times, current_time_sec, side='right')
 
-        # Calculate dot x position
-        accum_length = 0
-        for i, lap_time in enumerate(LAP_TIMES):
-            start_time = sum(LAP_TIMES[:i])
-            end_time = start_time + lap_time
-
-            if current_time_sec <= end_time:
-                segment_progress = (current_time_sec - start_time) / lap_time if lap_time > 0 else 0
-                dot_x = int(accum_length + segment_progress * segment_length[i])
-                segment_start_x = int(accum_length)
-                segment_end_x = int(accum_length + segment_length[i])
-                break
-            accum_length += segment_length[i]
-        else:
-            dot_x = WIDTH - 1
-            segment_start_x = int(WIDTH - 1)
-            segment_end_x = int(WIDTH)
 
-        # Check if dot_x is inside the bar segment for lap_done_idx (if lap_done_idx == len(LAP_TIMES), clamp)
-        if lap_done_idx == len(LAP_TIMES):
-            lap_done_idx -= 1
+def alignment_errors(frame_count=None):
+    """
+    Frames where the playhead sits outside the bar segment of the lap it is in,
+    checked for every frame at once. Returns (frames, dot_x, seg_start, seg_end)
+    arrays holding only the misaligned frames.
+    """
+    if frame_count is None:
+        frame_count = int(FPS * sum(LAP_TIMES))
+    times = np.arange(frame_count) / FPS
+    dot_x = playhead_x(times)
 
-        seg_start = int(sum(segment_length[:lap_done_idx]))
-        seg_end = int(sum(segment_length[:lap_done_idx + 1]))
+    # Laps finished so far picks the bar segment, same as save_bar_video
+    lap_done_idx = np.searchsorted(np.cumsum(LAP_TIMES), times, side="right")
+    lap_done_idx = np.minimum(lap_done_idx, len(LAP_TIMES) - 1)
 
-        if not (seg_start <= dot_x <= seg_end):
-            print(f"Frame {frame_idx}: Dot x={dot_x} outside bar segment [{seg_start}, {seg_end}] for lap {lap_done_idx}")
-            errors += 1
+    segment_length = (np.asarray(LAP_TIMES, dtype=np.float64) / sum(LAP_TIMES)) * WIDTH
+    segment_edges = np.concatenate([[0.0], np.cumsum(segment_length)]).astype(np.int64)
+    seg_start = segment_edges[lap_done_idx]
+    seg_end = segment_edges[lap_done_idx + 1]
 
-    if errors == 0:
-        print("All frames aligned correctly.")
+    bad = np.flatnonzero((dot_x < seg_start) | (dot_x > seg_end))
+    return bad, dot_x[bad], seg_start[bad], seg_end[bad]
+
+def test_alignment(max_report=20):
+    start = time.perf_counter()
+    frames, dot_x, seg_start, seg_end = alignment_errors()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for frame_idx, x, lo, hi in list(zip(frames, dot_x, seg_start, seg_end))[:max_report]:
+        print(f"Frame {frame_idx}: Dot x={x} outside bar segment [{lo}, {hi}]")
+
+    if len(frames) == 0:
+        print(f"All frames aligned correctly. ({elapsed_ms:.1f} ms)")
     else:
-        print(f"Found {errors} misaligned frames.")
+        print(f"Found {len(frames)} misaligned frames. ({elapsed_ms:.1f} ms)")
+    return len(frames)
 
 
 
@@ -150,14 +163,14 @@ def create_bar_overlay_frame(lap_done_idx):
             diff_text = f"{diff:+.3f}"
 
 
-            bbox = draw.textbbox((0,0), diff_text, font=FONT)
+            bbox = draw.textbbox((0,0), diff_text, font=get_font())
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
             text_x = start_x + (end_x - start_x - text_width) // 2
             text_y = y_pos - text_height // 2
 
-            draw.text((text_x, text_y), diff_text, fill=text_color, font=FONT)
+            draw.text((text_x, text_y), diff_text, fill=text_color, font=get_font())
 
 
 
@@ -168,14 +181,15 @@ def create_bar_overlay_frame(lap_done_idx):
 
 
 
+def bar_overlay_frames():
+    # One bar image per number of laps done, +1 to have final frame with all colored
+    return [create_bar_overlay_frame(lap_idx) for lap_idx in range(len(LAP_TIMES) + 1)]
+
 def save_bar_video(filename, duration_sec):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     writer = cv2.VideoWriter(filename, fourcc, FPS, (WIDTH, HEIGHT))
 
-    bar_overlay_imgs = []
-    for lap_idx in range(len(LAP_TIMES) + 1):  # +1 to have final frame with all colored
-        img = create_bar_overlay_frame(lap_idx)
-        bar_overlay_imgs.append(img)
+    bar_overlay_imgs = bar_overlay_frames()
 
     frame_count = int(FPS * duration_sec)
     lap_cumulative_times = np.cumsum(LAP_TIMES)
@@ -261,31 +275,62 @@ def time_to_x_pos_frame(frame_idx, total_frames):
     return x_pos
 
 
-def vertical_line_overlay(current_time_sec):
+def playhead_segments():
+    # Per lap: (lap time, start time, end time, bar segment start x, bar segment length)
+    laps = np.asarray(LAP_TIMES, dtype=np.float64)
     total_time = sum(LAP_TIMES)
-    
-    # Calculate accumulated pixel lengths (same as bar)
-    segment_length = [ (lap / total_time) * WIDTH for lap in LAP_TIMES ]
-    
-    accum_length = 0
-    for i, lap_time in enumerate(LAP_TIMES):
-        start_time = sum(LAP_TIMES[:i])
-        end_time = start_time + lap_time
-
-        if current_time_sec <= end_time:
-            # Inside this segment, interpolate position
-            segment_progress = (current_time_sec - start_time) / lap_time if lap_time > 0 else 0
-            x_pos = int(accum_length + segment_progress * segment_length[i])
-            break
-        accum_length += segment_length[i]
-    else:
-        # If time exceeds total, put line at the very end
-        x_pos = WIDTH - 1
-    
-    img = Image.new("RGB", (WIDTH, HEIGHT), (0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    draw.line([(x_pos, 0), (x_pos, HEIGHT)], fill=(255, 255, 255), width=2)
-    return np.array(img)
+    segment_length = (laps / total_time) * WIDTH  # same pixel lengths as the bar
+
+    end_times = np.cumsum(laps)
+    start_times = np.concatenate([[0.0], end_times[:-1]])
+    segment_start_x = np.concatenate([[0.0], np.cumsum(segment_length)[:-1]])
+    return laps, start_times, end_times, segment_start_x, segment_length
+
+def playhead_x(times_sec):
+    """
+    Playhead column for every time in times_sec at once: the bar segment of
+    the lap being driven, interpolated by progress through that lap, past the
+    last lap it sits at WIDTH - 1. Lap ends and segment starts are cumulative
+    sums worked out once, each time finds its lap with one searchsorted.
+    """
+    laps, start_times, end_times, segment_start_x, segment_length = playhead_segments()
+
+    times = np.asarray(times_sec, dtype=np.float64)
+    lap_idx = np.searchsorted(end_times, times, side="left")  # first lap ending at or after t
+    i = np.minimum(lap_idx, len(laps) - 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        segment_progress = np.where(laps[i] > 0, (times - start_times[i]) / laps[i], 0.0)
+    x_pos = (segment_start_x[i] + segment_progress * segment_length[i]).astype(np.int64)
+    return np.where(lap_idx < len(laps), x_pos, WIDTH - 1)
+
+def playhead_columns(x_pos):
+    # Columns PIL's width-2 vertical line at x_pos covers: x_pos and x_pos + 1, clipped to the frame
+    return slice(max(0, x_pos), max(0, min(WIDTH, x_pos + 2)))
+
+def vertical_line_overlay(current_time_sec):
+    img = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    img[:, playhead_columns(int(playhead_x(current_time_sec)))] = 255
+    return img
+
+def iter_playhead_frames(frame_count):
+    """
+    Yields the playhead frame for frames 0 .. frame_count-1. Every frame is
+    the same preallocated buffer with only the old line erased and the new
+    one drawn, so it has to be written before asking for the next one.
+    """
+    x_positions = playhead_x(np.arange(frame_count) / FPS)
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    columns = None
+
+    for x_pos in x_positions:
+        new_columns = playhead_columns(int(x_pos))
+        if new_columns != columns:
+            if columns is not None:
+                frame[:, columns] = 0
+            frame[:, new_columns] = 255
+            columns = new_columns
+        yield frame
 
 
 
@@ -294,10 +339,8 @@ def save_dot_video_sync(filename, duration_sec):
     writer = cv2.VideoWriter(filename, fourcc, FPS, (WIDTH, HEIGHT))
     frame_count = int(FPS * duration_sec)
     
-    for frame_idx in tqdm(range(frame_count), desc="Saving dot overlay reg video"):
-        current_time_sec = frame_idx / FPS  # exact current time
-        frame_rgb = vertical_line_overlay(current_time_sec)
-        writer.write(frame_rgb)
+    for frame in tqdm(iter_playhead_frames(frame_count), total=frame_count, desc="Saving dot overlay reg video"):
+        writer.write(frame)
     writer.release()
 
 
@@ -321,21 +364,156 @@ MP4 + mp4v: Slow(er), saves disk space, heavy CPU encoding load.
 If speed matters and you have enough disk space, uncompressed AVI is often faster. 
 If you want smaller files and can afford the encoding time, MP4 is better.
 """
-total_duration_sec = sum(LAP_TIMES)+END_DURATION  # Total duration is sum of laps
+def render_overlays():
+    total_duration_sec = sum(LAP_TIMES)+END_DURATION  # Total duration is sum of laps
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    bar_file = os.path.join(OUTPUT_DIR, BAR_FILE)
+    dot_file_reg = os.path.join(OUTPUT_DIR, DOT_FILE)
+    dot_file_trans = os.path.join(OUTPUT_DIR, DOT_AVI_FILE)
+    print("Creating bar overlay...")
+    save_bar_video(bar_file, total_duration_sec)
 
-bar_file = os.path.join(OUTPUT_DIR, BAR_FILE)
-dot_file_reg = os.path.join(OUTPUT_DIR, DOT_FILE)
-dot_file_trans = os.path.join(OUTPUT_DIR, DOT_AVI_FILE)
-print("Creating bar overlay...")
-save_bar_video(bar_file, total_duration_sec)
+    print("Creating dot overlay...")
+    save_dot_video_sync(dot_file_reg, total_duration_sec)
+    # save_dot_video_reg(dot_file_reg, total_duration_sec)
+    # save_dot_video_trans(dot_file_trans, total_duration_sec)
+    # print("✅ Done — overlays saved to:", OUTPUT_DIR)
+    return bar_file, dot_file_reg
 
-print("Creating dot overlay...")
-save_dot_video_sync(dot_file_reg, total_duration_sec)
-# save_dot_video_reg(dot_file_reg, total_duration_sec)
-# save_dot_video_trans(dot_file_trans, total_duration_sec)
-# print("✅ Done — overlays saved to:", OUTPUT_DIR)
 
 
+"""
+Composite backend: the bar only changes when a lap is done and the playhead
+is two columns, so each frame is the cached bar for the laps done with the
+playhead drawn on top, built in one buffer and piped to a single encoder.
+No bar/dot files, no decode and no colorkey pass softening the edges.
+"""
+def iter_segment_frames(frame_count):
+    """
+    Yields the composited frame for frames 0 .. frame_count-1. Every frame is
+    the same buffer: a lap change copies the new bar in, otherwise only the
+    old playhead columns are restored from the bar and the new ones drawn.
+    """
+    bars = bar_overlay_frames()
+    times = np.arange(frame_count) / FPS
+    lap_done_idx = np.searchsorted(np.cumsum(LAP_TIMES), times, side="right")
+    lap_done_idx = np.minimum(lap_done_idx, len(bars) - 1)
+    x_positions = playhead_x(times)
+
+    frame = np.empty_like(bars[0])
+    bar_idx = None
+    columns = None
+    for lap_idx, x_pos in zip(lap_done_idx, x_positions):
+        new_columns = playhead_columns(int(x_pos))
+        if lap_idx != bar_idx:
+            np.copyto(frame, bars[lap_idx])
+            bar_idx = lap_idx
+            columns = None
+        if new_columns != columns:
+            if columns is not None:
+                frame[:, columns] = bars[bar_idx][:, columns]
+            frame[:, new_columns] = 255
+            columns = new_columns
+        yield frame
+
+def render_segment_overlay(out_file):
+    frame_count = int(FPS * (sum(LAP_TIMES) + END_DURATION))
+    if os.path.dirname(out_file):
+        os.makedirs(os.path.dirname(out_file), exist_ok=True)
+
+    with FFmpegPipeWriter(out_file, FPS, (WIDTH, HEIGHT), use_gpu=USE_GPU) as writer:
+        for frame in tqdm(iter_segment_frames(frame_count), total=frame_count, desc="Rendering segment overlay"):
+            writer.write(frame)
+    print(f"✅ Overlay done: {out_file}")
+
+
+"""
+Filtergraph backend: ffmpeg makes every frame itself. The bar images go in as
+a concat timeline (one PNG per lap done), the playhead is a 2 px white
+source overlaid at an x expression compiled from LAP_TIMES, so Python never
+touches a frame. drawbox only evaluates x once, overlay's x is per frame.
+"""
+def playhead_expr():
+    """
+    playhead_x() as an ffmpeg expression: a balanced tree of
+    if(lte(t, lap end), ..., ...) that picks the lap in log2(laps) levels,
+    ffmpeg's parser gives up on a chain nested once per lap at ~100 laps.
+    The frame number is recovered from the frame's timestamp (overlay's own
+    n counter isn't 0-based on every ffmpeg build), then it's the same
+    operations in the same order on doubles, so ffmpeg lands on the same columns.
+    """
+    t = f"(round(t*{float(FPS)!r})/{float(FPS)!r})"
+    end_times = []
+    x_exprs = []
+    for lap, start, end, start_x, length in zip(*playhead_segments()):
+        lap, start, end, start_x, length = map(float, (lap, start, end, start_x, length))
+        if lap > 0:
+            x_exprs.append(f"trunc({start_x!r}+(({t}-{start!r})/{lap!r})*{length!r})")
+        else:
+            x_exprs.append(f"trunc({start_x!r})")
+        end_times.append(end)
+    x_exprs.append(str(WIDTH - 1))  # past the last lap
+
+    def pick(lo, hi):
+        # First lap in lo..hi-1 ending at or after t; lap ends are sorted so one split per level
+        if hi - lo == 1:
+            return x_exprs[lo]
+        mid = (lo + hi) // 2
+        return f"if(lte({t},{end_times[mid - 1]!r}),{pick(lo, mid)},{pick(mid, hi)})"
+
+    return pick(0, len(x_exprs))
+
+def bar_timeline_events(frame_count):
+    # (first frame, bar image) for each laps-done count, placed with the same searchsorted as the other backends
+    bars = bar_overlay_frames()
+    lap_done_idx = np.searchsorted(np.cumsum(LAP_TIMES), np.arange(frame_count) / FPS, side="right")
+    lap_done_idx = np.minimum(lap_done_idx, len(bars) - 1)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(lap_done_idx)) + 1])
+    return [(int(start), bars[lap_done_idx[start]]) for start in starts]
+
+def render_segment_filtergraph(out_file):
+    frame_count = int(FPS * (sum(LAP_TIMES) + END_DURATION))
+    if os.path.dirname(out_file):
+        os.makedirs(os.path.dirname(out_file), exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        events = bar_timeline_events(frame_count)
+        list_file = write_timeline_list(events, FPS, frame_count, temp_dir)
+
+        # round=down: each bar boundary sits half a frame after its first frame.
+        # Kept in bgr24 throughout, the encoder gets what the composite backend pipes it,
+        # so the yuv420p conversion (and every pixel) matches.
+        graph = (
+            f"[0:v]format=bgr24,fps=fps={FPS}:round=down[bar];"
+            f"[1:v]format=bgr24[line];"
+            f"[bar][line]overlay=x='{playhead_expr()}':y=0:eval=frame:format=rgb[out]"
+        )
+        # Long races make long expressions, a script file keeps clear of command-line limits
+        graph_file = os.path.join(temp_dir, "segment_graph.txt")
+        with open(graph_file, "w") as f:
+            f.write(graph)
+
+        cmd = [
+            FFMPEG_BIN, "-y",
+            "-loglevel", "error",
+            "-f", "concat", "-safe", "0",
+            "-i", list_file,
+            "-f", "lavfi",
+            "-i", f"color=c=white:s=2x{HEIGHT}:r={FPS}",
+            "-filter_complex_script", graph_file,
+            "-map", "[out]",
+            *get_encoder_opts(USE_GPU),
+            "-fps_mode", "cfr",
+            "-r", str(FPS),
+            "-frames:v", str(frame_count),
+            "-pix_fmt", "yuv420p",
+            out_file
+        ]
+        print(f"Encoding {len(events)} bar images with an ffmpeg playhead over {frame_count} frames")
+        subprocess.run(cmd, check=True)
+    print(f"✅ Overlay done: {out_file}")
+
 
 """
 if we make the dot overlay as .avi file then we can do this 
@@ -349,11 +527,7 @@ def run_ffmpeg_overlay(bar_overlay, dot_overlay, out_file):
         "-i", bar_overlay,
         "-i", dot_overlay,
         "-filter_complex", "[1:v]colorkey=0x000000:0.1:0.0[ckout];[0:v][ckout]overlay=shortest=1",
-        # "-c:v", "libx264", "-crf", "18", "-preset", "fast",
-        "-c:v", "h264_nvenc",
-        "-preset", "fast",   # NVENC presets
-        "-rc", "vbr",
-        "-cq", "18", 
+        *get_encoder_opts(USE_GPU),
         out_file
     ]
     print("Running ffmpeg overlay...")
@@ -385,71 +559,29 @@ def run_ffmpeg_concat(concat_txt, out_file):
     subprocess.run(cmd, check=True)
     print(f"✅ Final video saved: {out_file}")
 
-# def main():
-#     # 1️⃣ Step: Overlay bar + dot → segment_overlay.mp4
-#     run_ffmpeg_overlay(BAR_OVERLAY, DOT_OVERLAY, SEGMENT_OVERLAY)
-
-
-# if __name__ == "__main__":
-#     main()
-
-
-import sys
-from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QFileDialog, QMessageBox
-from PyQt6.QtCore import QThread, pyqtSignal
-import subprocess
-import os
-
-
-class OverlayWorker(QThread):
-    finished = pyqtSignal()
-    error = pyqtSignal(str)
-
-    def run(self):
-        try:
-            run_ffmpeg_overlay(BAR_OVERLAY, DOT_OVERLAY, SEGMENT_OVERLAY)
-            self.finished.emit()
-        except Exception as e:
-            self.error.emit(str(e))
-
-class SegmentOverlayApp(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Segment Overlay Generator")
-        self.resize(400, 200)
-
-        layout = QVBoxLayout()
-
-        self.status_label = QLabel("Click below to generate segment overlay video.")
-        layout.addWidget(self.status_label)
+def main():
+    if not LAP_TIMES:
+        load_race()
 
-        self.generate_button = QPushButton("Generate Overlay")
-        self.generate_button.clicked.connect(self.generate_overlay)
-        layout.addWidget(self.generate_button)
+    if CHECK_ALIGNMENT:
+        test_alignment()
 
-        self.setLayout(layout)
-        self.worker = None
+    if SEGMENT_BACKEND == "composite":
+        render_segment_overlay(SEGMENT_OVERLAY)
+        return
 
-    def generate_overlay(self):
-        self.generate_button.setEnabled(False)
-        self.status_label.setText("Processing...")
+    if SEGMENT_BACKEND == "filtergraph":
+        render_segment_filtergraph(SEGMENT_OVERLAY)
+        return
 
-        self.worker = OverlayWorker()
-        self.worker.finished.connect(self.on_finished)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+    # 1️⃣ Step: Render bar + dot overlays
+    bar_file, dot_file = render_overlays()
 
-    def on_finished(self):
-        self.status_label.setText(f"✅ Done: {SEGMENT_OVERLAY}")
-        self.generate_button.setEnabled(True)
+    # 2️⃣ Step: Overlay bar + dot → segment_overlay.mp4
+    run_ffmpeg_overlay(bar_file, dot_file, SEGMENT_OVERLAY)
 
-    def on_error(self, msg):
-        QMessageBox.critical(self, "Error", msg)
-        self.status_label.setText("❌ Failed")
-        self.generate_button.setEnabled(True)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = SegmentOverlayApp()
-    window.show()
-    sys.exit(app.exec())
+    # Qt only gets imported for the GUI, the headless entry point is python -m MakeSegmentOverlay
+    from MakeSegmentOverlay.segment_overlay_gui import run_gui
+    run_gui()
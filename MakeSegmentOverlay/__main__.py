@@ -0,0 +1,40 @@
+import sys
+import time
+
+from OverlayShared.cli import build_parser, common_overrides
+
+"""
+python -m MakeSegmentOverlay --csv race.csv --racer "EpicX18 GT9" -o Segment.mp4
+"""
+
+
+def main(argv=None):
+    parser = build_parser("python -m MakeSegmentOverlay", "Render the lap segment bar overlay.")
+    parser.add_argument("--backend", choices=["composite", "filtergraph", "overlay"],
+                        help="composite: one in-memory pass (default), filtergraph: ffmpeg draws the playhead, overlay: bar/dot files + colorkey")
+    parser.add_argument("--work-dir", help="where the intermediate bar/dot videos go (overlay backend)")
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        from MakeSegmentOverlay.segment_overlay_gui import run_gui
+        run_gui()
+        return
+
+    from MakeSegmentOverlay import SegmentOverlay_v1 as overlay
+
+    overrides = common_overrides(args, "SEGMENT_OVERLAY")
+    if args.backend:
+        overrides["SEGMENT_BACKEND"] = args.backend
+    if args.work_dir:
+        overrides["OUTPUT_DIR"] = args.work_dir
+    overlay.configure(**overrides)
+
+    start = time.perf_counter()
+    if not overlay.load_race(args.csv, args.racer):
+        sys.exit("❌ No lap times found for that racer")
+    overlay.main()
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import sys
+
+from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QMessageBox
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from MakeSegmentOverlay import SegmentOverlay_v1
+
+
+class OverlayWorker(QThread):
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def run(self):
+        try:
+            SegmentOverlay_v1.main()
+            self.finished.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+
+class SegmentOverlayApp(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Segment Overlay Generator")
+        self.resize(400, 200)
+
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel("Click below to generate segment overlay video.")
+        layout.addWidget(self.status_label)
+
+        self.generate_button = QPushButton("Generate Overlay")
+        self.generate_button.clicked.connect(self.generate_overlay)
+        layout.addWidget(self.generate_button)
+
+        self.setLayout(layout)
+        self.worker = None
+
+    def generate_overlay(self):
+        self.generate_button.setEnabled(False)
+        self.status_label.setText("Processing...")
+
+        self.worker = OverlayWorker()
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+
+    def on_finished(self):
+        self.status_label.setText(f"✅ Done: {SegmentOverlay_v1.SEGMENT_OVERLAY}")
+        self.generate_button.setEnabled(True)
+
+    def on_error(self, msg):
+        QMessageBox.critical(self, "Error", msg)
+        self.status_label.setText("❌ Failed")
+        self.generate_button.setEnabled(True)
+
+
+def run_gui():
+    app = QApplication(sys.argv)
+    window = SegmentOverlayApp()
+    window.show()
+    sys.exit(app.exec())
@@ -1,13 +1,16 @@
 import os
 import subprocess
 import tempfile
+import threading
+import time
 import cv2
 import numpy as np
 import math
 from math import ceil
+from contextlib import contextmanager
 
-from PIL import ImageFont, ImageDraw, Image
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from PIL import ImageDraw, Image
+from concurrent.futures import as_completed
 from tqdm import tqdm
 
 
@@ -18,9 +21,20 @@ CANVAS_HEIGHT = 1080
 
 FPS = 59.94
 USE_GPU = True
+RENDER_CACHE = True  # fingerprint each lap table so a rerun only re-renders tables whose rows changed
+TABLE_TIMELINE = True  # without the cache: encode each table once with a hold time instead of writing every frame
+SEGMENT_ENCODERS = 4  # lap tables encoded at once in RENDER_CACHE mode (NVENC caps concurrent sessions)
+RENDER_VERSION = 1  # bump when table drawing changes so old cached segments stop matching
+LAP_BACKEND = "thread"  # "process" renders lap tables in worker processes to get past the GIL
+LAP_WORKERS = None  # None = one per CPU
 START_DURATION = 5
 END_DURATION = 15
 OUTPUT_VIDEO_FILE = "Table_Overlay_(6-20-25)-R2.mp4"
+FIELD_OUTPUT_PATTERN = "Table_Overlay_{racer}.mp4"  # one file per racer in whole-field mode
+STANDINGS_OUTPUT_FILE = "Standings_Overlay_(6-20-25)-R2.mp4"  # whole-field standings, timed to RACER's laps
+AUTO_COLUMNS = True  # size COL_WIDTHS to the widest text in each column before rendering (fit_columns)
+CELL_PAD = 12  # space either side of the widest text in a column
+CANVAS_ALIGN = 16  # frame width rounded up to this (H.264 macroblocks)
 
 
 
@@ -30,21 +44,37 @@ FONT_SIZE = 64
 # from application.apps.raceStats.functions.racerTimersStats import get_racer_times, best_lap_deltas
 import sys
 sys.path.append("F:/_Small/344 School Python/TrackFootageEditor")
-from GatherRaceTimes.anaylsis_of_a_racers_times import get_racer_times, best_lap_deltas
+from GatherRaceTimes.anaylsis_of_a_racers_times import get_field_times, best_lap_deltas
+from OverlayShared.overlay_config import apply_overrides, load_font, racer_lap_times
+from OverlayShared.process_pool import completed_future, make_lap_executor, run_scaling_benchmark
+from OverlayShared.segment_cache import SegmentCache, fingerprint, file_fingerprint
+from OverlayShared.ffmpeg_pipe import concat_copy, encode_still, encode_timeline, get_encoder_opts
+from OverlayShared.field_batch import field_lap_times, field_output_paths, report_field_throughput
+from OverlayShared.canvas_fit import align_up, report_canvas
+from OverlayShared.text_sprites import TextSpriteCache
+from OverlayShared.text_layout import TextMetrics, table_layout
+from MakeTableOverlay.field_standings import Standings
 
-times = get_racer_times("F:\\_Small\\344 School Python\\TrackFootageEditor\\RaceStorage\\(6-20-25)-R2\\lap_times(6-20-25)-R2.csv", "EpicX18 GT9")
+RACE_CSV = "F:\\_Small\\344 School Python\\TrackFootageEditor\\RaceStorage\\(6-20-25)-R2\\lap_times(6-20-25)-R2.csv"
+RACER = "EpicX18 GT9"
 
-LAP_TIMES = best_lap_deltas(times)
+# Filled in by load_race(), nothing is read at import
+LAP_TIMES = []
 
 
 
 # Dynamic headers and column widths - add more columns here
 HEADERS = ["Lap", "Time", "Best Lap Diff"]  
 COL_WIDTHS = [100, 200, 220]
+STANDINGS_HEADERS = ["Pos", "Racer", "Laps", "Last", "Best Diff", "Gap"]
+STANDINGS_COL_WIDTHS = [90, 360, 100, 150, 180, 150]  # used as-is when AUTO_COLUMNS is off
 
 ROW_HEIGHT_MIN = 20
 ROW_HEIGHT_MAX = 40
 
+VIEWPORT_ROWS = None  # e.g. 10: fixed-height table showing only the last N laps (None = every lap)
+PIN_BEST_LAP = True  # in viewport mode, keep the best lap so far as an extra row once it scrolls off
+
 PADDING = {
     'top': 10,
     'bottom': 10,
@@ -58,17 +88,63 @@ TABLE_WIDTH = sum(COL_WIDTHS)
 FRAME_WIDTH = TABLE_WIDTH + PADDING['left'] + PADDING['right']
 FRAME_HEIGHT = (TOTAL_ROWS * ROW_HEIGHT_MAX) + PADDING['top'] + PADDING['bottom']
 
+def rows_frame_height(row_count):
+    # Header plus row_count rows at full row height
+    return ((row_count + 1) * ROW_HEIGHT_MAX) + PADDING['top'] + PADDING['bottom']
+
+def table_frame_height(lap_count):
+    if VIEWPORT_ROWS and lap_count > VIEWPORT_ROWS:
+        # Constant size however long the race is: last VIEWPORT_ROWS laps (+ pinned best lap)
+        lap_count = VIEWPORT_ROWS + (1 if PIN_BEST_LAP else 0)
+    return rows_frame_height(lap_count)
+
 TABLE_X = PADDING['left']
 TABLE_Y = PADDING['top']
 
+_config_overrides = {}
+def configure(**overrides):
+    """
+    Overrides config constants by name, e.g. configure(FPS=30, USE_GPU=False).
+    The same overrides are handed to process-pool workers.
+    """
+    apply_overrides(globals(), overrides, _config_overrides)
+
+def set_lap_times(lap_times):
+    # The frame height depends on how many rows the table ends up with
+    global LAP_TIMES, TOTAL_ROWS, FRAME_HEIGHT
+    LAP_TIMES = lap_times
+    TOTAL_ROWS = len(LAP_TIMES) + 1
+    FRAME_HEIGHT = table_frame_height(len(LAP_TIMES))
+
+def load_race(csv_path=None, racer=None):
+    times = racer_lap_times(csv_path or RACE_CSV, racer or RACER)
+    # Unknown racer or no laps: empty, best_lap_deltas() has no best lap to work from
+    set_lap_times(best_lap_deltas(times) if times else [])
+    return LAP_TIMES
+
+def init_table_worker(overrides, lap_times):
+    # Spawned workers re-import this module with the defaults, bring them up to date
+    configure(**overrides)
+    set_lap_times(lap_times)
+
 WHITE = (255, 255, 255)
+HIGHLIGHT = (0, 255, 0)  # the focused racer's row in the standings table
 
 
-font_cache = {}
 def get_font(font_size):
-    if font_size not in font_cache:
-        font_cache[font_size] = ImageFont.truetype(FONTPATH, font_size)
-    return font_cache[font_size]
+    return load_font(FONTPATH, font_size)
+
+# Every lap number, time and delta is measured and rasterized once and blitted from then on
+text_metrics = TextMetrics(get_font)
+text_sprites = TextSpriteCache(get_font, text_metrics)
+
+def draw_centered_text(img, text, x, y, font_size, color):
+    # Draws into img in place, only the text's own pixels are touched
+    return text_sprites.draw_centered(img, text, x, y, font_size, color)
+
+def report_text_cache():
+    text_metrics.report("Text layout")
+    print(f"Text sprites: {text_sprites.misses} rasterized, {text_sprites.hits} reused")
 
 def draw_centered_text_pil(img, text, x, y, font_size, color):
     pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
@@ -81,54 +157,158 @@ def draw_centered_text_pil(img, text, x, y, font_size, color):
     draw.text(position, text, font=font, fill=color)
     return cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
 
-def draw_table(img, x, y, data_rows):
-    total_rows = len(data_rows) + 1  # +1 for header
-    available_height = img.shape[0] - y - PADDING['bottom']
-    row_h = max(ROW_HEIGHT_MIN, min(ROW_HEIGHT_MAX, available_height // total_rows))
+def fit_columns(lap_time_sets=None, table_rows=None):
+    """
+    Sets COL_WIDTHS to the widest header/cell text per column plus CELL_PAD,
+    for every table this race (or field) will show, or for table_rows if given.
+    Goes through configure() so process-pool workers get the same layout.
+    """
+    if table_rows is None:
+        table_rows = [
+            row
+            for lap_times in lap_time_sets or [LAP_TIMES]
+            for row in lap_table_rows(len(lap_times), lap_times)
+        ]
+    # Frames are sized so rows are always ROW_HEIGHT_MAX tall, same font sizes as draw_table
+    layout = table_layout(TABLE_X, ROW_HEIGHT_MAX, tuple(COL_WIDTHS))
 
-    font_size_header = int(row_h * 0.8)
-    font_size_row = int(row_h * 0.7)
+    widths = [text_metrics.width(header, layout.header_size) for header in HEADERS]
+    for row in table_rows:
+        for j, cell in enumerate(row):
+            text = f"{cell}" if cell is not None else "N/A"
+            widths[j] = max(widths[j], text_metrics.width(text, layout.row_size))
 
-    # Draw header row
-    col_x = x
-    for i, header in enumerate(HEADERS):
-        center_x = col_x + COL_WIDTHS[i] // 2
-        img = draw_centered_text_pil(img, header, center_x, y + row_h // 2, font_size_header, WHITE)
-        col_x += COL_WIDTHS[i]
-    cv2.rectangle(img, (x, y), (x + TABLE_WIDTH, y + row_h), WHITE, 1)
-    # Vertical lines in header
-    col_x = x
-    for width in COL_WIDTHS[:-1]:
-        col_x += width
-        cv2.line(img, (col_x, y), (col_x, y + row_h), WHITE, 1)
+    col_widths = [width + 2 * CELL_PAD for width in widths]
+    table_width = sum(col_widths)
+    frame_width = align_up(table_width + PADDING['left'] + PADDING['right'], CANVAS_ALIGN)
+    if col_widths == COL_WIDTHS and frame_width == FRAME_WIDTH:
+        return
 
-    # Draw data rows
+    report_canvas("Table", (FRAME_WIDTH, FRAME_HEIGHT), (frame_width, FRAME_HEIGHT))
+    configure(COL_WIDTHS=col_widths, TABLE_WIDTH=table_width, FRAME_WIDTH=frame_width)
+
+def table_row_height(img_height, y, total_rows):
+    available_height = img_height - y - PADDING['bottom']
+    return max(ROW_HEIGHT_MIN, min(ROW_HEIGHT_MAX, available_height // total_rows))
+
+def draw_table(img, x, y, data_rows, highlight=None):
+    total_rows = len(data_rows) + 1  # +1 for header
+    row_h = table_row_height(img.shape[0], y, total_rows)
+
+    draw_table_header(img, x, y, row_h)
     for i, row in enumerate(data_rows):
-        top = y + row_h * (i + 1)
-        cv2.rectangle(img, (x, top), (x + TABLE_WIDTH, top + row_h), WHITE, 1)
-        col_x = x
-        for j, cell in enumerate(row):
-            center_x = col_x + COL_WIDTHS[j] // 2
-            text = f"{cell}" if cell is not None else "N/A"
-            img = draw_centered_text_pil(img, text, center_x, top + row_h // 2, font_size_row, WHITE)
-            col_x += COL_WIDTHS[j]
-        # vertical lines
-        col_x = x
-        for width in COL_WIDTHS[:-1]:
-            col_x += width
-            cv2.line(img, (col_x, top), (col_x, top + row_h), WHITE, 1)
+        draw_table_row(img, x, y, i, row, row_h, HIGHLIGHT if i == highlight else WHITE)
 
     return img
 
+def draw_table_header(img, x, y, row_h):
+    layout = table_layout(x, row_h, tuple(COL_WIDTHS))
 
-def create_blank_video(duration, filename):
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    writer = cv2.VideoWriter(filename, fourcc, FPS, (FRAME_WIDTH, FRAME_HEIGHT))
+    # Draw header row
+    for header, center_x in zip(HEADERS, layout.col_centers):
+        draw_centered_text(img, header, center_x, y + row_h // 2, layout.header_size, WHITE)
+    cv2.rectangle(img, (x, y), (x + TABLE_WIDTH, y + row_h), WHITE, 1)
+    # Vertical lines in header
+    for col_x in layout.col_lines:
+        cv2.line(img, (col_x, y), (col_x, y + row_h), WHITE, 1)
+
+def draw_table_row(img, x, y, i, row, row_h, color=WHITE):
+    # Data row i (0-based), drawn below the header
+    layout = table_layout(x, row_h, tuple(COL_WIDTHS))
+    top = y + row_h * (i + 1)
+    cv2.rectangle(img, (x, top), (x + TABLE_WIDTH, top + row_h), WHITE, 1)
+    for cell, center_x in zip(row, layout.col_centers):
+        text = f"{cell}" if cell is not None else "N/A"
+        draw_centered_text(img, text, center_x, top + row_h // 2, layout.row_size, color)
+    # vertical lines
+    for col_x in layout.col_lines:
+        cv2.line(img, (col_x, top), (col_x, top + row_h), WHITE, 1)
+
+
+def scroll_table_rows(img, y, visible, row_h):
+    # Moves row slots 1..visible-1 up into 0..visible-2, borders included
+    top = y + row_h
+    img[top:top + (visible - 1) * row_h + 1] = img[top + row_h:top + visible * row_h + 1]
+
+def table_spill(row, row_h):
+    """
+    Ink the header (row=None) or a row leaves in the slot below it, e.g.
+    descenders. Rows are drawn top-down, so a slot always holds the spill
+    of whatever sits above it under its own row.
+    """
+    strip = np.zeros((TABLE_Y + row_h * 3 + 1, FRAME_WIDTH, 3), dtype=np.uint8)
+    if row is None:
+        draw_table_header(strip, TABLE_X, TABLE_Y, row_h)
+    else:
+        draw_table_row(strip, TABLE_X, TABLE_Y, 0, row, row_h)
+    below = TABLE_Y + row_h * (1 if row is None else 2)
+    spill = strip[below + 1:below + row_h + 1]
+    return spill if spill.any() else None
+
+def redraw_table_slot(img, i, row, above, row_h, spills):
+    # Slot i rebuilt the way a full redraw leaves it: spill from the row above, then its own row
+    top = TABLE_Y + row_h * (i + 1)
+    region = img[top + 1:top + row_h + 1]
+    region[:, TABLE_X:TABLE_X + TABLE_WIDTH + 1] = 0
+
+    key = None if above is None else tuple(above)
+    if key not in spills:
+        spills[key] = table_spill(above, row_h)
+    if spills[key] is not None:
+        np.copyto(region, spills[key][:len(region)])
+
+    if row is not None:
+        draw_table_row(img, TABLE_X, TABLE_Y, i, row, row_h)
+
+
+def iter_table_snapshots(lap_times=None):
+    """
+    Yields (lap_number, rows, image) for lap_number = 0 .. len(lap_times),
+    rows being what table_display_rows() puts on screen.
+    Each image is the previous one plus the newly completed row, handed out
+    as a read-only copy. Rows never restyle later (deltas are against the
+    whole race's best lap), so nothing else needs redrawing. In viewport mode
+    a full table scrolls up one row and only the new row and the pinned
+    best-lap row are drawn.
+    """
+    lap_times = lap_times or LAP_TIMES
+    frame_height = table_frame_height(len(lap_times))
+    all_rows = lap_table_rows(len(lap_times), lap_times)
+    display = [table_display_rows(lap_number, lap_times) for lap_number in range(len(all_rows) + 1)]
+
+    img = np.zeros((frame_height, FRAME_WIDTH, 3), dtype=np.uint8)
+    # The frame is sized for the most rows ever shown, so row height doesn't change as rows are added
+    row_h = table_row_height(frame_height, TABLE_Y, max(len(rows) for rows in display) + 1)
+    constant_rows = row_h == table_row_height(frame_height, TABLE_Y, 1)
+
+    draw_table_header(img, TABLE_X, TABLE_Y, row_h)
+    spills = {}
+    for lap_number, rows in enumerate(display):
+        if lap_number == 0:
+            pass
+        elif not constant_rows:
+            img = draw_table(np.zeros_like(img), TABLE_X, TABLE_Y, rows)
+        elif not VIEWPORT_ROWS or lap_number <= VIEWPORT_ROWS:
+            draw_table_row(img, TABLE_X, TABLE_Y, lap_number - 1, all_rows[lap_number - 1], row_h)
+        else:
+            # Shifted rows keep their borders and spill-over, only the slots whose neighbour changed are rebuilt
+            n = VIEWPORT_ROWS
+            scroll_table_rows(img, TABLE_Y, n, row_h)
+            redraw_table_slot(img, 0, rows[0], None, row_h, spills)
+            if n > 1:
+                redraw_table_slot(img, n - 1, rows[n - 1], rows[n - 2], row_h, spills)
+            pinned = rows[n] if len(rows) > n else None
+            redraw_table_slot(img, n, pinned, rows[n - 1], row_h, spills)
+
+        snapshot = img.copy()
+        snapshot.flags.writeable = False
+        yield lap_number, rows, snapshot
+
+
+def create_blank_video(duration, segment_cache):
+    # Same blank for every race of this size, encoded once then reused from the cache
     blank = np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
-    frame_count = int(FPS* duration)
-    for _ in range(frame_count):
-        writer.write(blank)
-    writer.release()
+    return segment_cache.still_segment(blank, FPS, duration, use_gpu=USE_GPU)
 
 
 
@@ -145,22 +325,12 @@ def draw_headers():
 
     return img
 
-def create_headers_video(duration, filename):
-    frame_count = int(duration * FPS)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    writer = cv2.VideoWriter(filename, fourcc, FPS, (FRAME_WIDTH, FRAME_HEIGHT), True)
-
-    # Create a styled stats frame using PIL
-    # img = Image.new("RGB", (WIDTH, HEIGHT), (0, 0, 0))
-    # draw = ImageDraw.Draw(img)
+def create_headers_video(duration, segment_cache):
     img = draw_headers()
     
     frame_bgr = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
 
-    for _ in range(frame_count):
-        writer.write(frame_bgr)
-
-    writer.release()
+    return segment_cache.still_segment(frame_bgr, FPS, duration, use_gpu=USE_GPU)
 
 
 
@@ -224,8 +394,8 @@ def concat_videos(file_list, output_file):
 
 
 
-def create_lap_table(lap_number, target_lap, temp_dir):
-    current_laps = LAP_TIMES[:lap_number]
+def lap_table_rows(lap_number, lap_times=None):
+    current_laps = (lap_times or LAP_TIMES)[:lap_number]
     current_data = []
 
     for idx, current_lap in enumerate(current_laps):
@@ -234,6 +404,28 @@ def create_lap_table(lap_number, target_lap, temp_dir):
         delta = f"{current_lap[1]}"
         current_data.append([lap, time_str, delta])
 
+    return current_data
+
+def table_display_rows(lap_number, lap_times=None):
+    """
+    Rows on screen after lap_number laps. Normally every lap; in viewport
+    mode the last VIEWPORT_ROWS laps, plus the best lap so far as an extra
+    last row when it has scrolled off and PIN_BEST_LAP is set.
+    """
+    rows = lap_table_rows(lap_number, lap_times)
+    if not VIEWPORT_ROWS or len(rows) <= VIEWPORT_ROWS:
+        return rows
+
+    visible = rows[-VIEWPORT_ROWS:]
+    if PIN_BEST_LAP:
+        best = min(rows, key=lambda row: float(row[1]))
+        if best not in visible:
+            visible.append(best)
+    return visible
+
+def create_lap_table(lap_number, target_lap, temp_dir):
+    current_data = table_display_rows(lap_number)
+
     duration = float(target_lap[0])
     frame_count = int(duration * FPS)
     filename = os.path.join(temp_dir, f"lap_{lap_number:02}.mp4")
@@ -259,14 +451,7 @@ def create_lap_table(lap_number, target_lap, temp_dir):
 
 
 def create_last_lap_table(lap_number, temp_dir):
-    current_laps = LAP_TIMES[:lap_number]
-    current_data = []
-
-    for idx, current_lap in enumerate(current_laps):
-        lap = idx + 1
-        time_str = f"{current_lap[0]}"
-        delta = f"{current_lap[1]}"
-        current_data.append([lap, time_str, delta])
+    current_data = table_display_rows(lap_number)
 
     # duration = float(target_lap[0])
     frame_count = int(END_DURATION * FPS)
@@ -302,15 +487,271 @@ def create_last_lap_table(lap_number, temp_dir):
 
 
 
+"""
+Render cache mode: each lap table is a still segment stored under a fingerprint
+of its inputs (rows so far, hold time, layout, font, fps, codec). A timing
+correction to lap k only changes the tables from lap k on; everything else is
+reused and the whole overlay is joined by stream copy.
+"""
+def table_fingerprint(rows, frame_count, frame_height):
+    return fingerprint(
+        "table_lap", RENDER_VERSION, rows, frame_count,
+        HEADERS, COL_WIDTHS, ROW_HEIGHT_MIN, ROW_HEIGHT_MAX, PADDING, FRAME_WIDTH, frame_height,
+        VIEWPORT_ROWS, PIN_BEST_LAP,
+        file_fingerprint(FONTPATH), FPS, get_encoder_opts(USE_GPU),
+    )
+
+def table_segment_key(rows, frame_count, frame_height):
+    return f"table_lap_{table_fingerprint(rows, frame_count, frame_height)}"
+
+def build_table_segment(key, snapshot, frame_count, cache_dir):
+    # Pool task for a table the caller already missed, the snapshot is drawn in the parent
+    def render(temp_path):
+        encode_still(snapshot, FPS, frame_count, temp_path, use_gpu=USE_GPU)
+
+    return SegmentCache(cache_dir).build(key, render)
+
+def make_segment_executor(backend=None):
+    # Every worker runs its own encoder, so the process pool also defaults to the NVENC session cap
+    backend = backend or LAP_BACKEND
+    if backend == "process":
+        return make_lap_executor(backend, LAP_WORKERS or SEGMENT_ENCODERS, init_table_worker, (_config_overrides, LAP_TIMES))
+    return make_lap_executor(backend, SEGMENT_ENCODERS)
+
+def submit_table_segments(executor, segment_cache, lap_times, pending):
+    """
+    Looks up one segment per snapshot and queues the misses: table k is held
+    for lap k+1's time, the final table for END_DURATION. pending bounds how
+    many snapshots wait in the queue, long races would otherwise hold all of
+    them at once.
+    """
+    frame_height = table_frame_height(len(lap_times))
+    futures = []
+    for lap_number, rows, snapshot in iter_table_snapshots(lap_times):
+        if lap_number < len(lap_times):
+            frame_count = int(float(lap_times[lap_number][0]) * FPS)
+        else:
+            frame_count = int(END_DURATION * FPS)
+
+        key = table_segment_key(rows, frame_count, frame_height)
+        path = segment_cache.lookup(key)
+        if path is not None:
+            futures.append(completed_future(path))
+            continue
+
+        pending.acquire()
+        future = executor.submit(build_table_segment, key, snapshot, frame_count, segment_cache.cache_dir)
+        future.add_done_callback(lambda _: pending.release())
+        futures.append(future)
+    return futures
+
+def render_incremental(segment_cache):
+    pending = threading.BoundedSemaphore(SEGMENT_ENCODERS * 2)
+    with make_segment_executor() as executor:
+        futures = submit_table_segments(executor, segment_cache, LAP_TIMES, pending)
+        segments = [future.result() for future in tqdm(futures, desc="Rendering changed lap tables")]
+
+    segment_cache.report("Render cache")
+    report_text_cache()
+    concat_copy(segments, OUTPUT_VIDEO_FILE)
+
+
+"""
+Timeline mode: the table only changes at lap boundaries, so the overlay is a
+short list of (start frame, snapshot) events and each snapshot goes to the
+encoder once, held on the CFR grid until the next one.
+"""
+def table_timeline(lap_times=None):
+    lap_times = lap_times or LAP_TIMES
+    events = []
+    start = 0
+    for lap_number, rows, snapshot in iter_table_snapshots(lap_times):
+        events.append((start, snapshot))
+        if lap_number < len(lap_times):
+            start += int(float(lap_times[lap_number][0]) * FPS)
+    # Final table held for END_DURATION
+    return events, start + int(END_DURATION * FPS)
+
+def render_timeline():
+    events, frame_total = table_timeline()
+    print(f"Encoding {len(events)} table snapshots over {frame_total} frames")
+    report_text_cache()
+    encode_timeline(events, FPS, frame_total, OUTPUT_VIDEO_FILE, use_gpu=USE_GPU)
+
+
+"""
+Whole-field mode: the CSV is read once, every racer's tables go on one pool and
+share the font cache and segment cache, each racer gets their own output file.
+"""
+def render_field(csv_path=None, racers=None, output_pattern=None):
+    field = field_lap_times(get_field_times(csv_path or RACE_CSV), racers)
+    field = {racer: best_lap_deltas(times) for racer, times in field.items()}
+    outputs = field_output_paths(output_pattern or FIELD_OUTPUT_PATTERN, field)
+    if AUTO_COLUMNS:
+        fit_columns(list(field.values()))
+
+    segment_cache = SegmentCache()
+    start = time.perf_counter()
+
+    pending = threading.BoundedSemaphore(SEGMENT_ENCODERS * 2)
+    with make_segment_executor() as executor:
+        jobs = {
+            racer: submit_table_segments(executor, segment_cache, lap_times, pending)
+            for racer, lap_times in field.items()
+        }
+
+        for racer, futures in tqdm(jobs.items(), desc="Rendering field"):
+            concat_copy([future.result() for future in futures], outputs[racer])
+
+    frame_total = sum(
+        sum(int(float(target_lap[0]) * FPS) for target_lap in lap_times) + int(END_DURATION * FPS)
+        for lap_times in field.values()
+    )
+    segment_cache.report("Render cache")
+    report_text_cache()
+    report_field_throughput(outputs, frame_total, time.perf_counter() - start)
+    return outputs
+
+
+"""
+Standings mode: one table for the whole field, re-ordered every time RACER
+crosses the line (the footage is theirs). Positions, gaps and lap times for
+every racer come out of one pass over the CSV matrix (field_standings), each
+snapshot is drawn once and the video goes through the same sparse timeline.
+"""
+def standings_rows(standings, k):
+    # Snapshot k as table rows in position order, plus the focused racer's row index
+    rows = []
+    for r in standings.order[k]:
+        laps = standings.laps[k, r]
+        if laps == 0:
+            rows.append([standings.position[k, r], standings.racers[r], 0, "-", "-", "-"])
+            continue
+
+        last = standings.last_lap[k, r]
+        best_diff = last - standings.best_lap[k, r]
+        if standings.gap_laps[k, r]:
+            gap = f"+{standings.gap_laps[k, r]}L"
+        elif standings.position[k, r] == 1:
+            gap = "Leader"
+        else:
+            gap = f"+{standings.gap_time[k, r]:.3f}"
+        rows.append([standings.position[k, r], standings.racers[r], laps, f"{last:.3f}", f"{best_diff:+.3f}", gap])
+
+    return rows, list(standings.order[k]).index(standings.focus)
+
+STANDINGS_LAYOUT = ("HEADERS", "COL_WIDTHS", "TABLE_WIDTH", "FRAME_WIDTH", "FRAME_HEIGHT")
+
+@contextmanager
+def standings_layout(racer_count):
+    """
+    Standings headers, widths and frame size for the with block only. The lap
+    table's layout (and the overrides workers get) is put back afterwards, so
+    a later main() or render_field() in the same process draws lap tables.
+    """
+    saved = {name: globals()[name] for name in STANDINGS_LAYOUT}
+    saved_overrides = dict(_config_overrides)
+    try:
+        # One row per racer, the table never grows
+        configure(HEADERS=STANDINGS_HEADERS, FRAME_HEIGHT=rows_frame_height(racer_count))
+        if not AUTO_COLUMNS:
+            table_width = sum(STANDINGS_COL_WIDTHS)
+            configure(COL_WIDTHS=STANDINGS_COL_WIDTHS, TABLE_WIDTH=table_width,
+                      FRAME_WIDTH=align_up(table_width + PADDING['left'] + PADDING['right'], CANVAS_ALIGN))
+        yield
+    finally:
+        globals().update(saved)
+        _config_overrides.clear()
+        _config_overrides.update(saved_overrides)
+
+def standings_timeline(standings):
+    snapshots = [standings_rows(standings, k) for k in range(len(standings))]
+    if AUTO_COLUMNS:
+        fit_columns(table_rows=[row for rows, _ in snapshots for row in rows])
+
+    events = []
+    start = 0
+    for k, (rows, focus_row) in enumerate(tqdm(snapshots, desc="Drawing standings")):
+        img = draw_table(np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8), TABLE_X, TABLE_Y, rows, highlight=focus_row)
+        events.append((start, img))
+        if k < len(standings.focus_laps):
+            start += int(standings.focus_laps[k] * FPS)
+    # Final standings held for END_DURATION
+    return events, start + int(END_DURATION * FPS)
+
+def render_standings(csv_path=None, racer=None, output_file=None):
+    field = get_field_times(csv_path or RACE_CSV)
+    racer = racer or RACER
+    if racer not in field:
+        print(f"❌ {racer} is not in the race")
+        return None
+
+    standings = Standings(field, racer)
+    if LAP_BACKEND != "thread":
+        print(f"⚠️ LAP_BACKEND={LAP_BACKEND!r} has no effect on standings, the table is one encode")
+    output_file = output_file or STANDINGS_OUTPUT_FILE
+    with standings_layout(len(standings.racers)):
+        events, frame_total = standings_timeline(standings)
+    print(f"Encoding {len(events)} standings snapshots for {len(standings.racers)} racers over {frame_total} frames")
+    report_text_cache()
+    encode_timeline(events, FPS, frame_total, output_file, use_gpu=USE_GPU)
+    print(f"✅ Standings Overlay Video saved as {output_file}")
+    return output_file
+
+
+def render_lap_tables(temp_dir, backend=None, workers=None):
+    # Fonts are loaded lazily per worker through get_font(), nothing big to share
+    backend = backend or LAP_BACKEND
+    workers = workers or LAP_WORKERS
+
+    lap_videos = []
+    with make_lap_executor(backend, workers, init_table_worker, (_config_overrides, LAP_TIMES)) as executor:
+        futures = {
+                    executor.submit(create_lap_table, i , target_lap, temp_dir): i
+                    for i, target_lap in enumerate(LAP_TIMES)
+                }
+
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Rendering laps in parallel"):
+            lap_videos.append(future.result())
+
+    return lap_videos
+
+def benchmark_worker_scaling(worker_counts=(1, 2, 4, 8, 16)):
+    # Renders this race's lap tables with the process backend and reports frames/s per worker count
+    frame_total = sum(int(float(target_lap[0]) * FPS) for target_lap in LAP_TIMES)
+
+    def run(workers):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            render_lap_tables(temp_dir, backend="process", workers=workers)
+
+    return run_scaling_benchmark(run, frame_total, worker_counts)
+
+
 def main():
+    if not LAP_TIMES:
+        load_race()
+    if AUTO_COLUMNS:
+        fit_columns()
 
+    segment_cache = SegmentCache()
+
+    if RENDER_CACHE:
+        render_incremental(segment_cache)
+        print(f"✅ Table Overlay Video saved as {OUTPUT_VIDEO_FILE}")
+        return
+
+    if TABLE_TIMELINE:
+        if LAP_BACKEND != "thread":
+            print(f"⚠️ LAP_BACKEND={LAP_BACKEND!r} has no effect in timeline mode, the table is one encode")
+        render_timeline()
+        print(f"✅ Table Overlay Video saved as {OUTPUT_VIDEO_FILE}")
+        return
 
     with tempfile.TemporaryDirectory() as temp_dir:
         # 1. Create start blank video
-        start_blank = os.path.join(temp_dir, "start_blank.mp4")
         print("Creating Blank")
-        create_blank_video(START_DURATION, start_blank)
-        # create_headers_video(END_DURATION, filename)
+        start_blank = create_blank_video(START_DURATION, segment_cache)
+        # create_headers_video(END_DURATION, segment_cache)
         last_lap_video = create_last_lap_table(len(LAP_TIMES), temp_dir)
         # 2. Render laps in parallel
         lap_videos = [last_lap_video]
@@ -325,17 +766,7 @@ def main():
             lap_video = create_lap_table( 1, LAP_TIMES[1], temp_dir)
             lap_videos.append(lap_video)
         else:
-            with ThreadPoolExecutor() as executor:
-                futures = {
-                            executor.submit(create_lap_table, i , target_lap, temp_dir): i
-                            for i, target_lap in enumerate(LAP_TIMES)
-                        }
-
-                for future in tqdm(as_completed(futures), total=len(futures), desc="Rendering laps in parallel"):
-                    lap_number = futures[future]
-                    lap_videos.append(future.result())
-
-
+            lap_videos += render_lap_tables(temp_dir)
 
         # Sort videos by lap number (they can complete out of order)
         lap_videos.sort(key=lambda x: int(os.path.basename(x).split('_')[1].split('.')[0]))
@@ -347,110 +778,7 @@ def main():
         print(f"✅ Timer Overlay Video saved as {OUTPUT_VIDEO_FILE}")
 
 
-# if __name__ == "__main__":
-#     main()
-#     # cProfile.run('main()')
-
-
-
-
-import sys
-import os
-import subprocess
-import tempfile
-from pathlib import Path
-from PyQt6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog, QMessageBox, QProgressBar
-)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-
-
-
-
-class OverlayThread(QThread):
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, output_file):
-        super().__init__()
-        self.output_file = output_file
-
-    def run(self):
-        try:
-            OUTPUT_VIDEO_FILE = self.output_file
-            main()
-            self.finished.emit(self.output_file)
-        except Exception as e:
-            self.error.emit(str(e))
-
-
-class OverlayApp(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Lap Table Overlay Generator")
-        self.resize(400, 200)
-
-        layout = QVBoxLayout()
-
-        self.status_label = QLabel("Ready")
-        layout.addWidget(self.status_label)
-
-        self.pick_button = QPushButton("Set Output File")
-        self.pick_button.clicked.connect(self.pick_output_file)
-        layout.addWidget(self.pick_button)
-
-        self.generate_button = QPushButton("Generate Overlay")
-        self.generate_button.clicked.connect(self.generate_overlay)
-        self.generate_button.setEnabled(False)
-        layout.addWidget(self.generate_button)
-
-        self.progress = QProgressBar()
-        self.progress.setRange(0, 0)
-        self.progress.setVisible(False)
-        layout.addWidget(self.progress)
-
-        self.setLayout(layout)
-
-        self.output_file = None
-        self.thread = None
-
-    def pick_output_file(self):
-        suggested_path = Path("F:/GoProExports")
-        default_name = "LapOverlay.mp4"
-
-        path, _ = QFileDialog.getSaveFileName(self, "Choose Output File", str(suggested_path / default_name), "MP4 files (*.mp4)")
-        if path:
-            if not path.lower().endswith(".mp4"):
-                path += ".mp4"
-            self.output_file = path
-            self.status_label.setText(f"Output: {path}")
-            self.generate_button.setEnabled(True)
-
-    def generate_overlay(self):
-        self.status_label.setText("Rendering overlay...")
-        self.generate_button.setEnabled(False)
-        self.progress.setVisible(True)
-
-        self.thread = OverlayThread(self.output_file)
-        self.thread.finished.connect(self.on_done)
-        self.thread.error.connect(self.on_error)
-        self.thread.start()
-
-    def on_done(self, file):
-        self.status_label.setText(f"Done: {file}")
-        self.progress.setVisible(False)
-        self.generate_button.setEnabled(True)
-        QMessageBox.information(self, "Success", f"Overlay saved to: {file}")
-
-    def on_error(self, msg):
-        self.status_label.setText("Error")
-        self.progress.setVisible(False)
-        self.generate_button.setEnabled(True)
-        QMessageBox.critical(self, "Failed", msg)
-
-
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = OverlayApp()
-    window.show()
-    sys.exit(app.exec())
+    # Qt only gets imported for the GUI, the headless entry point is python -m MakeTableOverlay
+    from MakeTableOverlay.table_overlay_gui import run_gui
+    run_gui()
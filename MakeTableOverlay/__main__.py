@@ -0,0 +1,64 @@
+import sys
+import time
+
+from OverlayShared.cli import add_lap_backend_arguments, build_parser, common_overrides, lap_backend_overrides
+
+"""
+python -m MakeTableOverlay --csv race.csv --racer "EpicX18 GT9" -o Table.mp4
+python -m MakeTableOverlay --csv race.csv --all-racers -o "Table_{racer}.mp4"
+python -m MakeTableOverlay --csv race.csv --racer "EpicX18 GT9" --standings -o Standings.mp4
+"""
+
+
+def main(argv=None):
+    parser = build_parser("python -m MakeTableOverlay", "Render the lap table overlay.")
+    parser.add_argument("--viewport", type=int, metavar="N", help="fixed-height table showing only the last N laps")
+    parser.add_argument("--no-pin-best", action="store_true", help="in viewport mode, don't pin the best lap once it scrolls off")
+    parser.add_argument("--all-racers", action="store_true", help="one overlay per racer in the CSV, -o is a pattern with {racer}")
+    parser.add_argument("--standings", action="store_true", help="whole-field standings table, re-ordered at each of --racer's laps")
+    add_lap_backend_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        from MakeTableOverlay.table_overlay_gui import run_gui
+        run_gui()
+        return
+
+    from MakeTableOverlay import TableOverlay_v5 as overlay
+
+    if args.standings:
+        output_setting = "STANDINGS_OUTPUT_FILE"
+    elif args.all_racers:
+        output_setting = "FIELD_OUTPUT_PATTERN"
+    else:
+        output_setting = "OUTPUT_VIDEO_FILE"
+    overrides = common_overrides(args, output_setting)
+    overrides.update(lap_backend_overrides(args))
+    if args.viewport:
+        overrides["VIEWPORT_ROWS"] = args.viewport
+    if args.no_pin_best:
+        overrides["PIN_BEST_LAP"] = False
+    overlay.configure(**overrides)
+
+    if args.standings:
+        if not overlay.render_standings(args.csv, args.racer):
+            sys.exit("❌ No standings rendered")
+        return
+
+    if args.all_racers:
+        try:
+            overlay.render_field(args.csv)
+        except ValueError as e:
+            # Output pattern without {racer} or racers whose files would collide
+            sys.exit(f"❌ {e}")
+        return
+
+    start = time.perf_counter()
+    if not overlay.load_race(args.csv, args.racer):
+        sys.exit("❌ No lap times found for that racer")
+    overlay.main()
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
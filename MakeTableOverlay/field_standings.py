@@ -0,0 +1,59 @@
+import numpy as np
+
+"""
+Whole-field standings from one parsed lap_times CSV.
+Everything is computed on the (laps x racers) matrix at once; the table
+changes whenever the focused racer (whose footage this is) crosses the line.
+"""
+
+
+def field_matrix(field):
+    # {racer: [times]} -> racers, (laps x racers) float matrix with NaN for missing laps
+    racers = list(field)
+    lap_count = max((len(times) for times in field.values()), default=0)
+    times = np.full((lap_count, len(racers)), np.nan)
+    for r, racer in enumerate(racers):
+        column = [np.nan if t is None else t for t in field[racer]]
+        times[:len(column), r] = column
+    return racers, times
+
+
+class Standings:
+    """
+    Field state at each of the focused racer's line crossings.
+    Every array is (snapshots, racers); snapshot 0 is the start, snapshot k
+    is the moment the focused racer completes lap k.
+    """
+
+    def __init__(self, field, focus):
+        self.racers, times = field_matrix(field)
+        self.focus = self.racers.index(focus)
+
+        # A missing lap leaves everything after it unknown (NaN propagates through cumsum)
+        crossings = np.cumsum(times, axis=0)
+        crossings = np.where(np.isnan(crossings), np.inf, crossings)
+        focus_crossings = crossings[:, self.focus]
+        self.times = np.concatenate([[0.0], focus_crossings[np.isfinite(focus_crossings)]])
+        # Lap times the snapshots are held for (frame counts use these, not the rounded cumsum)
+        self.focus_laps = times[:len(self.times) - 1, self.focus]
+
+        # Laps each racer had completed at each snapshot time
+        self.laps = (crossings[None, :, :] <= self.times[:, None, None]).sum(axis=1)
+        last = np.clip(self.laps - 1, 0, None)
+        done = self.laps > 0
+
+        self.last_crossing = np.where(done, np.take_along_axis(crossings, last, axis=0), 0.0)
+        self.last_lap = np.where(done, np.take_along_axis(np.nan_to_num(times, nan=np.inf), last, axis=0), np.nan)
+        best = np.fmin.accumulate(np.where(np.isnan(times), np.inf, times), axis=0)
+        self.best_lap = np.where(done, np.take_along_axis(best, last, axis=0), np.nan)
+
+        # More laps first, then whoever crossed the line earlier; lexsort is stable so ties keep CSV order
+        self.order = np.lexsort((self.last_crossing, -self.laps))
+        self.position = np.argsort(self.order, axis=1) + 1
+
+        leader = self.order[:, :1]
+        self.gap_laps = np.take_along_axis(self.laps, leader, axis=1) - self.laps
+        self.gap_time = self.last_crossing - np.take_along_axis(self.last_crossing, leader, axis=1)
+
+    def __len__(self):
+        return len(self.times)
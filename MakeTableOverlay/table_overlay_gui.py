@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog, QMessageBox, QProgressBar
+)
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from MakeTableOverlay import TableOverlay_v5
+
+
+class OverlayThread(QThread):
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, output_file):
+        super().__init__()
+        self.output_file = output_file
+
+    def run(self):
+        try:
+            TableOverlay_v5.configure(OUTPUT_VIDEO_FILE=self.output_file)
+            TableOverlay_v5.main()
+            self.finished.emit(self.output_file)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class OverlayApp(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Lap Table Overlay Generator")
+        self.resize(400, 200)
+
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel("Ready")
+        layout.addWidget(self.status_label)
+
+        self.pick_button = QPushButton("Set Output File")
+        self.pick_button.clicked.connect(self.pick_output_file)
+        layout.addWidget(self.pick_button)
+
+        self.generate_button = QPushButton("Generate Overlay")
+        self.generate_button.clicked.connect(self.generate_overlay)
+        self.generate_button.setEnabled(False)
+        layout.addWidget(self.generate_button)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.setVisible(False)
+        layout.addWidget(self.progress)
+
+        self.setLayout(layout)
+
+        self.output_file = None
+        self.thread = None
+
+    def pick_output_file(self):
+        suggested_path = Path("F:/GoProExports")
+        default_name = "LapOverlay.mp4"
+
+        path, _ = QFileDialog.getSaveFileName(self, "Choose Output File", str(suggested_path / default_name), "MP4 files (*.mp4)")
+        if path:
+            if not path.lower().endswith(".mp4"):
+                path += ".mp4"
+            self.output_file = path
+            self.status_label.setText(f"Output: {path}")
+            self.generate_button.setEnabled(True)
+
+    def generate_overlay(self):
+        self.status_label.setText("Rendering overlay...")
+        self.generate_button.setEnabled(False)
+        self.progress.setVisible(True)
+
+        self.thread = OverlayThread(self.output_file)
+        self.thread.finished.connect(self.on_done)
+        self.thread.error.connect(self.on_error)
+        self.thread.start()
+
+    def on_done(self, file):
+        self.status_label.setText(f"Done: {file}")
+        self.progress.setVisible(False)
+        self.generate_button.setEnabled(True)
+        QMessageBox.information(self, "Success", f"Overlay saved to: {file}")
+
+    def on_error(self, msg):
+        self.status_label.setText("Error")
+        self.progress.setVisible(False)
+        self.generate_button.setEnabled(True)
+        QMessageBox.critical(self, "Failed", msg)
+
+
+def run_gui():
+    app = QApplication(sys.argv)
+    window = OverlayApp()
+    window.show()
+    sys.exit(app.exec())
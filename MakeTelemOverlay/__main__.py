@@ -0,0 +1,28 @@
+import argparse
+
+"""
+python -m MakeTelemOverlay session.gpx other.gpx --fps 59.94
+python -m MakeTelemOverlay (no files) opens the Qt window
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m MakeTelemOverlay", description="Render the accelerometer overlay for GPX files.")
+    parser.add_argument("gpx", nargs="*", help="GPX files, each renders to <name>_telem_overlay.mp4")
+    parser.add_argument("--fps", type=float, default=59.94, help="output frame rate")
+    args = parser.parse_args(argv)
+
+    if not args.gpx:
+        from MakeTelemOverlay.telem_overlay_gui import run_gui
+        run_gui()
+        return
+
+    # Heavy imports only once the arguments are known to be good
+    from MakeTelemOverlay.telem_overlay import generate_overlay_video
+
+    for gpx_file in args.gpx:
+        generate_overlay_video(gpx_file, gpx_file.replace(".gpx", "_telem_overlay.mp4"), fps=args.fps)
+
+
+if __name__ == "__main__":
+    main()
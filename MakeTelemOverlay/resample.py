@@ -0,0 +1,98 @@
+import numpy as np
+
+"""
+Telemetry put on the video's frame clock. Sensors log at their own rates
+(accel ~200 Hz, gyro ~200 Hz, GPS ~18 Hz); resample_to_frames() linearly
+interpolates every channel at each frame's time once, so the render loop
+and the media view look values up by frame number instead of searching
+timestamps per frame.
+"""
+
+
+class FrameTelemetry:
+    """
+    Channels sampled once per frame. values is one C-contiguous
+    (channels, frames) block: each channel is a contiguous row, and
+    values[:, frame] is everything at that frame.
+    Channels are named "stream.channel", e.g. "accel.x", "gps.lat".
+    """
+
+    def __init__(self, names, values, fps, offset):
+        self.names = tuple(names)
+        self.values = values
+        self.fps = fps
+        self.offset = offset
+        self.rows = {name: row for row, name in enumerate(self.names)}
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def __getitem__(self, name):
+        # Whole channel as a view, e.g. frames["accel.x"][i]
+        return self.values[self.rows[name]]
+
+    def frame(self, index):
+        return dict(zip(self.names, self.values[:, index].tolist()))
+
+    def frame_at(self, seconds):
+        # Frame showing video time seconds, clamped to the resampled range
+        return min(max(int(round(seconds * self.fps)), 0), len(self) - 1)
+
+    def frame_time(self, index):
+        # Telemetry time sampled for this frame
+        return self.offset + index / self.fps
+
+
+def interp_weights(times, query_times):
+    """
+    Left/right sample indices and right-hand weights for linear
+    interpolation of query_times, held at the end values outside times.
+    Computed once per stream and shared by all its channels.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if len(times) == 1:
+        zeros = np.zeros(len(query_times), dtype=np.intp)
+        return zeros, zeros, np.zeros(len(query_times))
+
+    query_times = np.clip(query_times, times[0], times[-1])
+    right = np.clip(np.searchsorted(times, query_times, side="right"), 1, len(times) - 1)
+    left = right - 1
+    span = times[right] - times[left]
+    span[span == 0] = 1  # repeated timestamps, take the left value
+    return left, right, (query_times - times[left]) / span
+
+
+def resample_to_frames(streams, fps, frame_count=None, offset=0.0, dtype=np.float64):
+    """
+    streams is {stream: {'time': seconds, channel: values, ...}} (or a
+    telem_store.TelemetrySession). Frame i samples telemetry time
+    offset + i / fps. frame_count defaults to the end of the longest stream.
+    Returns a FrameTelemetry.
+    """
+    if hasattr(streams, "stream"):
+        streams = {name: streams.stream(name) for name in streams.streams}
+
+    if frame_count is None:
+        end = max(float(channels["time"][-1]) for channels in streams.values() if len(channels["time"]))
+        frame_count = max(int(np.floor((end - offset) * fps)) + 1, 0)
+    frame_times = offset + np.arange(frame_count) / fps
+
+    names = [f"{stream}.{name}" for stream, channels in streams.items() for name in channels if name != "time"]
+    values = np.empty((len(names), frame_count), dtype=dtype)
+    row = 0
+    for stream, channels in streams.items():
+        columns = [v for name, v in channels.items() if name != "time"]
+        if len(channels["time"]) == 0:
+            values[row:row + len(columns)] = np.nan
+            row += len(columns)
+            continue
+        # One search per stream, every channel of it reuses the indices and weights
+        left, right, weight = interp_weights(channels["time"], frame_times)
+        for column in columns:
+            column = np.asarray(column, dtype=np.float64)
+            start = column[left]
+            np.multiply(column[right] - start, weight, out=values[row], casting="unsafe")
+            values[row] += start
+            row += 1
+
+    return FrameTelemetry(names, values, fps, offset)
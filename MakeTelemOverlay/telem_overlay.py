@@ -3,6 +3,13 @@ import pandas as pd
 import xml.etree.ElementTree as ET
 import numpy as np
 
+import os
+import sys
+# Run as a script the package directory is on sys.path, not the repo root the imports below need
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from MakeTelemOverlay.telem_store import TelemetryStore
+from MakeTelemOverlay import smoothing
+from MakeTelemOverlay.resample import resample_to_frames
 
 """
 https://goprotelemetryextractor.com/free/#
@@ -12,47 +19,86 @@ https://goprotelemetryextractor.com/free/#
 - for generating the GPX file
 """
 
+GPX_NS = '{http://www.topografix.com/GPX/1/1}'
+GPXACC_NS = '{http://www.garmin.com/xmlschemas/AccelerationExtension/v1}'
+TELEM_CACHE = True  # Keep parsed GPX channels in .overlay_cache/telemetry, re-renders skip the parse
+
 # 1️⃣ Parse GPX acceleration data with timestamps
 def parse_gpx_accel(gpx_file):
-    ns = {'gpxacc': 'http://www.garmin.com/xmlschemas/AccelerationExtension/v1'}
-    tree = ET.parse(gpx_file)
-    root = tree.getroot()
-
+    """
+    Streams the GPX with iterparse instead of building the whole tree: each
+    trackpoint's time text and first accel's x/y/z strings are kept and the
+    element is dropped as soon as it closes, so memory stays flat however
+    long the session. Strings become numbers/timestamps in one call each.
+    """
     times = []
     x_vals = []
     y_vals = []
     z_vals = []
     print("Make DF")
-    for trkpt in root.findall('.//{http://www.topografix.com/GPX/1/1}trkpt'):
-        time_elem = trkpt.find('{http://www.topografix.com/GPX/1/1}time')
-        acc_elem = trkpt.find('.//gpxacc:accel', ns)
-        if time_elem is not None and acc_elem is not None:
-            time_text = time_elem.text
-            x = float(acc_elem.attrib['x'])
-            y = float(acc_elem.attrib['y'])
-            z = float(acc_elem.attrib['z'])
-            pd_time = pd.to_datetime(time_text)
-            times.append(pd_time)
-            x_vals.append(x)
-            y_vals.append(y)
-            z_vals.append(z)
+
+    parents = []
+    point_time = point_accel = None
+    in_trkpt = False
+    for event, elem in ET.iterparse(gpx_file, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            if elem.tag == GPX_NS + 'trkpt':
+                in_trkpt = True
+                point_time = point_accel = None
+            continue
+
+        parents.pop()
+        if not in_trkpt:
+            continue
+        if elem.tag == GPX_NS + 'time' and point_time is None:
+            point_time = elem.text
+        elif elem.tag == GPXACC_NS + 'accel' and point_accel is None:
+            point_accel = (elem.attrib['x'], elem.attrib['y'], elem.attrib['z'])
+        elif elem.tag == GPX_NS + 'trkpt':
+            in_trkpt = False
+            if point_time is not None and point_accel is not None:
+                times.append(point_time)
+                x_vals.append(point_accel[0])
+                y_vals.append(point_accel[1])
+                z_vals.append(point_accel[2])
+            # Finished trackpoints are always the parent's first child, so this is O(1)
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
 
     df = pd.DataFrame({
-        'time': pd.to_datetime(times),
-        'x': x_vals,
-        'y': y_vals,
-        'z': z_vals
+        'time': pd.to_datetime(times, format='ISO8601'),
+        'x': np.array(x_vals, dtype=np.float64),
+        'y': np.array(y_vals, dtype=np.float64),
+        'z': np.array(z_vals, dtype=np.float64)
     })
     df['time_sec'] = (df['time'] - df['time'].iloc[0]).dt.total_seconds()
 
     return df
 
+def gpx_accel_streams(gpx_file):
+    # TelemetryStore loader: the parsed GPX as one 'accel' stream
+    df = parse_gpx_accel(gpx_file)
+    streams = {'accel': {
+        'time': df['time_sec'].to_numpy(),
+        'x': df['x'].to_numpy(),
+        'y': df['y'].to_numpy(),
+        'z': df['z'].to_numpy()
+    }}
+    meta = {'start_time': df['time'].iloc[0].isoformat()} if len(df) else {}
+    return streams, meta
+
+def load_accel(gpx_file):
+    # {'time', 'x', 'y', 'z'} arrays, memory-mapped from the store when TELEM_CACHE is on
+    if not TELEM_CACHE:
+        return gpx_accel_streams(gpx_file)[0]['accel']
+    return TelemetryStore().open(gpx_file, 'gpx', gpx_accel_streams).stream('accel')
+
 # 2️⃣ EMA smoothing
 def ema(data, alpha=0.1):
-    smoothed = [data[0]]
-    for val in data[1:]:
-        smoothed.append(alpha * val + (1 - alpha) * smoothed[-1])
-    return smoothed
+    # Vectorized, also takes (samples, channels) arrays; see smoothing.py
+    return smoothing.ema(data, alpha)
 
 # 2️⃣ Map G-force to screen coords
 def map_to_screen(x_g, y_g, center_x, center_y, scale=200):
@@ -81,8 +127,8 @@ def draw_horizontal_bar(frame, center_x, pos_y, width, val, max_val=2.0, color=(
 
 def generate_overlay_video(gpx_file, output_file, fps=59.94, duration=None):
     print(f"Generating overlay for {gpx_file} → {output_file}")
-    df = parse_gpx_accel(gpx_file)
-    total_duration = duration if duration else df['time_sec'].iloc[-1]
+    accel = load_accel(gpx_file)
+    total_duration = duration if duration else accel['time'][-1]
     total_frames = int(total_duration * fps)
 
     frame_width, frame_height = 640, 480
@@ -92,10 +138,11 @@ def generate_overlay_video(gpx_file, output_file, fps=59.94, duration=None):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(output_file, fourcc, fps, (frame_width, frame_height))
 
-    time_points = np.linspace(0, total_duration, total_frames)
-    x_interp = np.interp(time_points, df['time_sec'], df['x'])
-    y_interp = np.interp(time_points, df['time_sec'], df['y'])
-    z_interp = np.interp(time_points, df['time_sec'], df['z'])
+    # Every channel on the frame clock in one pass, frame i is telemetry time i / fps
+    frames = resample_to_frames({'accel': accel}, fps, frame_count=total_frames)
+    x_interp = frames['accel.x']
+    y_interp = frames['accel.y']
+    z_interp = frames['accel.z']
 
     for i in range(total_frames):
         frame = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
@@ -127,75 +174,7 @@ def generate_overlay_video(gpx_file, output_file, fps=59.94, duration=None):
     print(f"Saved overlay video: {output_file}")
 
 
-
-
-import sys
-from PyQt6.QtWidgets import (
-    QApplication, QWidget, QPushButton, QVBoxLayout, QFileDialog, QLabel, QListWidget, QMessageBox
-)
-from PyQt6.QtCore import QThread, pyqtSignal
-
-class WorkerThread(QThread):
-    finished = pyqtSignal(str)
-
-    def __init__(self, gpx_file):
-        super().__init__()
-        self.gpx_file = gpx_file
-        self.output_file = gpx_file.replace(".gpx", "_telem_overlay.mp4")
-
-    def run(self):
-        generate_overlay_video(self.gpx_file, self.output_file)
-        self.finished.emit(self.output_file)
-
-class OverlayApp(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Multi-GPX Overlay Generator")
-
-        self.label = QLabel("Queued files:")
-        self.file_list = QListWidget()
-        self.button_add = QPushButton("Add GPX File")
-        self.button_generate = QPushButton("Generate All Overlays")
-
-        layout = QVBoxLayout()
-        layout.addWidget(self.label)
-        layout.addWidget(self.file_list)
-        layout.addWidget(self.button_add)
-        layout.addWidget(self.button_generate)
-        self.setLayout(layout)
-
-        self.button_add.clicked.connect(self.add_file)
-        self.button_generate.clicked.connect(self.generate_all)
-
-        self.threads = []
-
-    def add_file(self):
-        files, _ = QFileDialog.getOpenFileNames(self, "Select GPX Files", "", "GPX Files (*.gpx)")
-        for file in files:
-            if file and file not in [self.file_list.item(i).text() for i in range(self.file_list.count())]:
-                self.file_list.addItem(file)
-
-    def generate_all(self):
-        if self.file_list.count() == 0:
-            QMessageBox.warning(self, "No Files", "Add some GPX files first.")
-            return
-
-        for i in range(self.file_list.count()):
-            gpx_file = self.file_list.item(i).text()
-            thread = WorkerThread(gpx_file)
-            thread.finished.connect(self.on_finished)
-            thread.start()
-            self.threads.append(thread)
-
-        self.button_generate.setEnabled(False)
-
-    def on_finished(self, output):
-        QMessageBox.information(self, "Overlay Done", f"Generated: {output}")
-        if all(not t.isRunning() for t in self.threads):
-            self.button_generate.setEnabled(True)
-
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = OverlayApp()
-    window.show()
-    sys.exit(app.exec())
+    # Qt only gets imported for the GUI, python -m MakeTelemOverlay renders GPX files headless
+    from MakeTelemOverlay.telem_overlay_gui import run_gui
+    run_gui()
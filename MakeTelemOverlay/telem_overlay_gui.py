@@ -0,0 +1,74 @@
+import sys
+
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QPushButton, QVBoxLayout, QFileDialog, QLabel, QListWidget, QMessageBox
+)
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from MakeTelemOverlay.telem_overlay import generate_overlay_video
+
+
+class WorkerThread(QThread):
+    finished = pyqtSignal(str)
+
+    def __init__(self, gpx_file):
+        super().__init__()
+        self.gpx_file = gpx_file
+        self.output_file = gpx_file.replace(".gpx", "_telem_overlay.mp4")
+
+    def run(self):
+        generate_overlay_video(self.gpx_file, self.output_file)
+        self.finished.emit(self.output_file)
+
+class OverlayApp(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Multi-GPX Overlay Generator")
+
+        self.label = QLabel("Queued files:")
+        self.file_list = QListWidget()
+        self.button_add = QPushButton("Add GPX File")
+        self.button_generate = QPushButton("Generate All Overlays")
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.label)
+        layout.addWidget(self.file_list)
+        layout.addWidget(self.button_add)
+        layout.addWidget(self.button_generate)
+        self.setLayout(layout)
+
+        self.button_add.clicked.connect(self.add_file)
+        self.button_generate.clicked.connect(self.generate_all)
+
+        self.threads = []
+
+    def add_file(self):
+        files, _ = QFileDialog.getOpenFileNames(self, "Select GPX Files", "", "GPX Files (*.gpx)")
+        for file in files:
+            if file and file not in [self.file_list.item(i).text() for i in range(self.file_list.count())]:
+                self.file_list.addItem(file)
+
+    def generate_all(self):
+        if self.file_list.count() == 0:
+            QMessageBox.warning(self, "No Files", "Add some GPX files first.")
+            return
+
+        for i in range(self.file_list.count()):
+            gpx_file = self.file_list.item(i).text()
+            thread = WorkerThread(gpx_file)
+            thread.finished.connect(self.on_finished)
+            thread.start()
+            self.threads.append(thread)
+
+        self.button_generate.setEnabled(False)
+
+    def on_finished(self, output):
+        QMessageBox.information(self, "Overlay Done", f"Generated: {output}")
+        if all(not t.isRunning() for t in self.threads):
+            self.button_generate.setEnabled(True)
+
+def run_gui():
+    app = QApplication(sys.argv)
+    window = OverlayApp()
+    window.show()
+    sys.exit(app.exec())
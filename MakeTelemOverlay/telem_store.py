@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from OverlayShared.segment_cache import fingerprint
+
+"""
+Parsed telemetry kept on disk so a session is only parsed once.
+
+Each session is a directory of one .npy file per channel, opened with
+mmap_mode='r': opening is a few small reads and slicing a time window only
+touches the pages in that window. A session is stored under a hash of its
+source file's contents; a small index keyed by path, size and mtime points
+at it, so an unchanged file isn't even re-hashed.
+
+Layout of a session: {stream: {channel: 1-D array}}. Every stream has a
+'time' channel in seconds (sorted), streams can have different rates
+(e.g. accel at 200 Hz, gps at 18 Hz).
+"""
+
+TELEM_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".overlay_cache", "telemetry")
+STORE_VERSION = 1  # bump when a loader changes so old sessions stop matching
+
+
+def file_content_hash(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class TelemetrySession:
+    """
+    One source file's channels, memory-mapped from the store.
+    Arrays are read-only views of the files on disk.
+    """
+
+    def __init__(self, session_dir):
+        self.session_dir = session_dir
+        with open(os.path.join(session_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        self._arrays = {}
+
+    @property
+    def streams(self):
+        # {stream: [channel, ...]}
+        return self.meta["streams"]
+
+    def channel(self, stream, name):
+        key = (stream, name)
+        if key not in self._arrays:
+            path = os.path.join(self.session_dir, f"{stream}.{name}.npy")
+            self._arrays[key] = np.load(path, mmap_mode="r")
+        return self._arrays[key]
+
+    def stream(self, stream):
+        return {name: self.channel(stream, name) for name in self.streams[stream]}
+
+    def window_slice(self, stream, t0, t1):
+        # Index range of the samples with t0 <= time <= t1
+        time = self.channel(stream, "time")
+        return slice(int(np.searchsorted(time, t0, side="left")), int(np.searchsorted(time, t1, side="right")))
+
+    def window(self, stream, t0, t1):
+        """
+        Every channel of stream between t0 and t1 seconds, as views into the
+        mapped files; nothing outside the window is read.
+        """
+        index = self.window_slice(stream, t0, t1)
+        return {name: self.channel(stream, name)[index] for name in self.streams[stream]}
+
+    def duration(self, stream):
+        time = self.channel(stream, "time")
+        return float(time[-1] - time[0]) if len(time) else 0.0
+
+
+class TelemetryStore:
+    """
+    open(source_path, kind, loader) hands back a TelemetrySession, calling
+    loader(source_path) -> ({stream: {channel: array}}, extra_meta) only when
+    no session with that content has been stored yet.
+    """
+
+    def __init__(self, cache_dir=TELEM_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_dir = os.path.join(cache_dir, "index")
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def index_path(self, source_path, kind):
+        st = os.stat(source_path)
+        key = fingerprint(kind, STORE_VERSION, os.path.abspath(source_path), st.st_size, st.st_mtime_ns)
+        return os.path.join(self.index_dir, f"{key}.json")
+
+    def session_dir(self, kind, content_hash):
+        return os.path.join(self.cache_dir, f"{kind}_v{STORE_VERSION}_{content_hash}")
+
+    def open(self, source_path, kind, loader):
+        index_path = self.index_path(source_path, kind)
+        indexed_hash = None
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                indexed_hash = json.load(f)["content_hash"]
+        content_hash = indexed_hash
+        if content_hash is None or not os.path.isdir(self.session_dir(kind, content_hash)):
+            # New or touched file: hash it, the contents may still match a stored session
+            content_hash = file_content_hash(source_path)
+
+        session_dir = self.session_dir(kind, content_hash)
+        if os.path.isdir(session_dir):
+            self.hits += 1
+        else:
+            self.misses += 1
+            streams, extra_meta = loader(source_path)
+            self.save(session_dir, streams, dict(extra_meta, kind=kind, source=os.path.abspath(source_path)))
+
+        if content_hash != indexed_hash:
+            with open(index_path, "w") as f:
+                json.dump({"content_hash": content_hash, "source": os.path.abspath(source_path)}, f)
+        return TelemetrySession(session_dir)
+
+    def save(self, session_dir, streams, meta):
+        # Written next to the final directory and renamed in, so a killed parse never leaves a bad hit
+        temp_dir = f"{session_dir}.{uuid.uuid4().hex}.part"
+        os.makedirs(temp_dir)
+        try:
+            for stream, channels in streams.items():
+                for name, values in channels.items():
+                    np.save(os.path.join(temp_dir, f"{stream}.{name}.npy"), np.ascontiguousarray(values))
+            meta = dict(meta, streams={stream: list(channels) for stream, channels in streams.items()})
+            with open(os.path.join(temp_dir, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            os.replace(temp_dir, session_dir)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if not os.path.isdir(session_dir):
+                raise
+            # Someone else stored the same session first
+
+    def report(self, label):
+        print(f"{label}: {self.hits} opened from the store, {self.misses} parsed")
+
+
+"""
+GoPro Telemetry Extractor CSVs (one file per sensor: ACCL, GYRO, GPS5).
+Columns are found by keyword, the export's unit suffixes and mojibake
+(e.g. "[m/sÂ²]") vary between versions. 'cts' is milliseconds.
+"""
+GOPRO_COLUMNS = {
+    "accel": {"x": ("accelerometer", "(x"), "y": ("accelerometer", "(y"), "z": ("accelerometer", "(z")},
+    "gyro": {"x": ("gyroscope", "(x"), "y": ("gyroscope", "(y"), "z": ("gyroscope", "(z")},
+    "gps": {
+        "lat": ("gps", "lat"),
+        "lon": ("gps", "long"),
+        "alt": ("gps", "alt"),
+        "speed_2d": ("gps", "2d"),
+        "speed_3d": ("gps", "3d"),
+    },
+}
+
+
+def find_column(columns, keywords):
+    return next((c for c in columns if all(k in c.lower() for k in keywords)), None)
+
+
+def gopro_csv_streams(path):
+    """
+    Loader for one GoPro CSV: ({stream: {'time', channels...}}, meta), the
+    stream (accel/gyro/gps) picked from which columns the file has.
+    """
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    for stream, wanted in GOPRO_COLUMNS.items():
+        found = {name: find_column(df.columns, keywords) for name, keywords in wanted.items()}
+        if any(column is None for column in found.values()):
+            continue
+
+        channels = {"time": df["cts"].to_numpy(dtype=np.float64) / 1000.0}
+        channels.update({name: df[column].to_numpy(dtype=np.float64) for name, column in found.items()})
+        temp_column = find_column(df.columns, ("temperature",))
+        if temp_column is not None:
+            channels["temp"] = df[temp_column].to_numpy(dtype=np.float64)
+
+        meta = {}
+        if "date" in df.columns and len(df):
+            meta["start_time"] = str(df["date"].iloc[0])
+        return {stream: channels}, meta
+
+    raise ValueError(f"No accelerometer, gyroscope or GPS columns in {path}")
+
+
+def open_gopro_csv(path, store=None):
+    return (store or TelemetryStore()).open(path, "gopro_csv", gopro_csv_streams)
@@ -1,12 +1,14 @@
 import os
 import subprocess
 import tempfile
+import threading
+import time
 import cv2
 import numpy as np
 import math
 from math import ceil
 
-from PIL import ImageFont, ImageDraw, Image
+from PIL import ImageDraw, Image
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
@@ -15,27 +17,80 @@ import cProfile
 # Config
 WIDTH = 800
 HEIGHT = 600
+AUTO_CANVAS = True  # shrink WIDTH x HEIGHT to the race's drawn text before rendering (fit_canvas)
+CANVAS_PAD = 8  # black margin kept around the text
+CANVAS_ALIGN = 16  # canvas sides rounded up to this (H.264 macroblocks)
+CANVAS_OFFSET = (0, 0)  # where the fitted canvas's top-left sits in the configured WIDTH x HEIGHT layout
 MAX_TIME = 25.000  # seconds
 
 FPS = 59.94
 USE_GPU = True
+STREAM_ENCODE = True  # pipe raw frames into one ffmpeg process instead of per-lap mp4v files + concat re-encode
+STREAM_QUEUE_FRAMES = 120  # frames each lap may buffer ahead of the encoder
+RENDER_CACHE = True  # fingerprint each lap segment so a rerun only re-renders laps whose inputs changed
+SEGMENT_ENCODERS = 4  # lap segments encoded at once in RENDER_CACHE mode (NVENC caps concurrent sessions)
+RENDER_VERSION = 1  # bump when lap drawing changes so old cached segments stop matching
+LAP_BACKEND = "thread"  # "process" renders laps in worker processes to get past the GIL (per-lap files + concat)
+LAP_WORKERS = None  # None = one per CPU
 START_DURATION = 5  # seconds blank start screen
 END_DURATION = 15  # seconds hold last frame
 OUTPUT_VIDEO_FILE = "Timer_Overlay_(6-20-25)-R2.mp4"
-OUTPUT_COUNTUP_TIMER = "timer_temp.mp4"
+FIELD_OUTPUT_PATTERN = "Timer_Overlay_{racer}.mp4"  # one file per racer in whole-field mode
+
+# Burn-in mode: draw the timer straight onto the footage instead of a black overlay video
+BURN_IN_SOURCE = None  # e.g. "F:/_Large/GoKart Vids/GH012596(6-20-25)-R2.MP4"
+BURN_IN_OUTPUT = "Timer_BurnIn_(6-20-25)-R2.mp4"
+RACE_START_OFFSET = 0.0  # seconds into the footage where lap 1 starts
+BURN_IN_POSITION = (0, 0)  # where the WIDTH x HEIGHT timer canvas's top-left lands on the footage
+BURN_IN_QUEUE = 32  # frames buffered between the decode, draw and encode stages
 
 FONT_PATH = "C:\\Users\\epics\\AppData\\Local\\Microsoft\\Windows\\Fonts\\NIS-Heisei-Mincho-W9-Condensed.TTF"
 FONT_SIZE = 64
+TIMER_CHARS = "0123456789. sec"  # every glyph the count-up timer can show
+TIMER_BATCH = 240  # timer frames rasterized per vectorized atlas pass
+TIMER_CACHE_MB = 256  # memory ceiling for cached timer text patches
 
 
 import sys
 sys.path.append("F:/_Small/344 School Python/TrackFootageEditor")
-from GatherRaceTimes.anaylsis_of_a_racers_times import get_racer_times, best_lap_deltas
-
-LAP_TIMES = get_racer_times("F:\\_Small\\344 School Python\\TrackFootageEditor\\RaceStorage\\(6-20-25)-R2\\lap_times(6-20-25)-R2.csv", "EpicX18 GT9")
-
-
-FONT = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+from GatherRaceTimes.anaylsis_of_a_racers_times import get_field_times, best_lap_deltas
+from OverlayShared.overlay_config import apply_overrides, load_font, racer_lap_times
+from OverlayShared.ffmpeg_pipe import FFmpegPipeWriter, ReorderBuffer, concat_copy, get_encoder_opts
+from OverlayShared.segment_cache import SegmentCache, fingerprint, file_fingerprint
+from OverlayShared.video_pipeline import PrefetchReader, QueuedWriter
+from OverlayShared.glyph_atlas import GlyphAtlas
+from MakeTimerOverlay.timer_frames import TimerFrameSource, PatchFrames, LapFrameCompositor
+from OverlayShared.process_pool import SharedArray, make_lap_executor, run_scaling_benchmark
+from OverlayShared.field_batch import field_lap_times, field_output_paths, report_field_throughput
+from OverlayShared.canvas_fit import fit_box, report_canvas, union_box
+from OverlayShared.text_layout import TextMetrics
+
+RACE_CSV = "F:\\_Small\\344 School Python\\TrackFootageEditor\\RaceStorage\\(6-20-25)-R2\\lap_times(6-20-25)-R2.csv"
+RACER = "EpicX18 GT9"
+
+# Nothing is read at import, load_race() / get_font() fill these in on first use
+LAP_TIMES = []
+FONT = None
+
+_config_overrides = {}
+def configure(**overrides):
+    """
+    Overrides config constants by name, e.g. configure(FPS=30, USE_GPU=False).
+    The same overrides are handed to process-pool workers.
+    """
+    apply_overrides(globals(), overrides, _config_overrides)
+
+def load_race(csv_path=None, racer=None):
+    global LAP_TIMES
+    LAP_TIMES = racer_lap_times(csv_path or RACE_CSV, racer or RACER)
+    return LAP_TIMES
+
+def get_font():
+    # FONT can be set directly to use an already loaded font
+    return FONT if FONT is not None else load_font(FONT_PATH, FONT_SIZE)
+
+# Every label, timer string and stats line is measured once; the timer only has the one font size
+text_metrics = TextMetrics(lambda font_size: get_font())
 
 DISTANCE_FROM_CENTER = 80
 
@@ -55,16 +110,56 @@ def draw_centered_text(draw, text, pos=TEXT_POSITIONS):
         start_y = pos["start_y"]
         spacing = pos["spacing"]
         for i, text in enumerate(text):
-            text_bbox = FONT.getbbox(text)
-            text_w = text_bbox[2] - text_bbox[0]
-            text_h = text_bbox[3] - text_bbox[1]
+            text_w = text_metrics.width(text, FONT_SIZE)
             y = start_y + i * spacing
-            draw.text((x - text_w // 2, y), text, font=FONT, fill=fill)
+            draw.text((x - text_w // 2, y), text, font=get_font(), fill=fill)
     else:
-        text_bbox = FONT.getbbox(text)
-        text_w = text_bbox[2] - text_bbox[0]
+        text_w = text_metrics.width(text, FONT_SIZE)
         y = pos["y"]
-        draw.text((x - text_w // 2, y), text, font=FONT, fill=fill)
+        draw.text((x - text_w // 2, y), text, font=get_font(), fill=fill)
+
+def centered_ink_box(text, pos, y):
+    # Ink extent of draw_centered_text() for one line
+    text_w = text_metrics.width(text, FONT_SIZE)
+    return text_metrics.ink_box(text, FONT_SIZE, pos.get("x", WIDTH // 2) - text_w // 2, y)
+
+def content_box(lap_time_sets):
+    # Everything a race draws: lap labels, every timer string and the end stats
+    lap_pos, timer_pos, stats_pos = TEXT_POSITIONS["lap"], TEXT_POSITIONS["timer"], TEXT_POSITIONS["stats"]
+    lap_count = max(len(lap_times) for lap_times in lap_time_sets)
+
+    boxes = [centered_ink_box(f"Lap {n:02}", lap_pos, lap_pos["y"]) for n in range(1, lap_count + 1)]
+    timer_texts = {timer_text(idx) for idx in range(int(MAX_TIME * FPS))}
+    boxes += [centered_ink_box(text, timer_pos, timer_pos["y"]) for text in timer_texts]
+    for lap_times in lap_time_sets:
+        boxes += [
+            centered_ink_box(line, stats_pos, stats_pos["start_y"] + i * stats_pos["spacing"])
+            for i, line in enumerate(stats_lines(lap_times))
+        ]
+    return union_box(boxes)
+
+def fit_canvas(lap_time_sets=None):
+    """
+    Shrinks WIDTH x HEIGHT to the measured text (plus CANVAS_PAD, sides a
+    multiple of CANVAS_ALIGN) and moves TEXT_POSITIONS to match.
+    Goes through configure() so process-pool workers get the same canvas.
+    """
+    lap_time_sets = lap_time_sets or [LAP_TIMES]
+    x0, y0, width, height = fit_box(content_box(lap_time_sets), (WIDTH, HEIGHT), CANVAS_PAD, CANVAS_ALIGN)
+    if (width, height) == (WIDTH, HEIGHT):
+        return
+
+    positions = {}
+    for name, pos in TEXT_POSITIONS.items():
+        pos = dict(pos, x=pos.get("x", WIDTH // 2) - x0)
+        for key in ("y", "start_y"):
+            if key in pos:
+                pos[key] -= y0
+        positions[name] = pos
+
+    offset = (CANVAS_OFFSET[0] + x0, CANVAS_OFFSET[1] + y0)
+    report_canvas("Timer", (WIDTH, HEIGHT), (width, height), offset)
+    configure(WIDTH=width, HEIGHT=height, TEXT_POSITIONS=positions, CANVAS_OFFSET=offset)
 
 def draw_center_cross_hair(draw):
     # Red crosshair lines
@@ -86,36 +181,31 @@ def draw_center_cross_hair(draw):
 
 
 
-def generate_timer_video():
-    total_frames = int(MAX_TIME * FPS)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(OUTPUT_COUNTUP_TIMER, fourcc, FPS, (WIDTH, HEIGHT), True)
+_timer_atlas = None
+def get_timer_atlas():
+    # Glyphs are rasterized once, every timer frame after that is slice copies
+    global _timer_atlas
+    if _timer_atlas is None:
+        _timer_atlas = GlyphAtlas(get_font(), TIMER_CHARS, TEXT_POSITIONS["timer"]["fill"])
+    return _timer_atlas
 
-    for frame in tqdm(range(total_frames), desc="Rendering timer video"):
-        time_elapsed = frame / FPS
-        time_text = f"{time_elapsed:.3f} sec"
-        # time_text = f"{time_elapsed:06.3f} sec"
+def timer_text(frame):
+    time_elapsed = frame / FPS
+    return f"{time_elapsed:.3f} sec"
+    # return f"{time_elapsed:06.3f} sec"
 
-        img = Image.new("RGB", (WIDTH, HEIGHT), (0, 0, 0))  # Black background
-        draw = ImageDraw.Draw(img)
-
-        draw_centered_text(draw, time_text, TEXT_POSITIONS["timer"])
-
-        frame_bgr = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-        out.write(frame_bgr)
-
-    out.release()
-
-def preload_timer_frames():
-    cap = cv2.VideoCapture(OUTPUT_COUNTUP_TIMER)
-    frames = []
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frames.append(frame)
-    cap.release()
-    return frames
+def get_timer_frame_source():
+    # Frames are computed on demand, so MAX_TIME no longer decides how much RAM we use
+    pos = TEXT_POSITIONS["timer"]
+    return TimerFrameSource(
+        get_timer_atlas(),
+        frame_count=int(MAX_TIME * FPS),
+        text_for=timer_text,
+        frame_size=(WIDTH, HEIGHT),
+        x=pos["x"],
+        y=pos["y"],
+        max_bytes=TIMER_CACHE_MB * 1024 ** 2,
+    )
 
 
 """
@@ -140,78 +230,189 @@ def create_lap_overlay_and_mask(lap_number):
     lap_mask = np.any(lap_overlay != 0, axis=2).astype(np.uint8) * 255  # mask 0 or 255 for OpenCV
     return lap_overlay, lap_mask
 
-def render_frame(lap_overlay, lap_mask, time_elapsed, timer_frames):
-    frame_idx = int(time_elapsed * FPS)
-    if frame_idx >= len(timer_frames):
-        frame_idx = len(timer_frames) - 1
-
-    base_frame = timer_frames[frame_idx].copy()
-
-    # Use OpenCV copyTo with mask - much faster than numpy boolean indexing
-    cv2.copyTo(lap_overlay, lap_mask, base_frame)
-
-    return base_frame
+def lap_frame_count(lap_time):
+    return math.floor(FPS * lap_time) + 1
+
+_compositors = threading.local()
+
+def get_lap_compositor(timer_frames):
+    # One persistent buffer per worker thread (and per process on the process backend)
+    compositor = getattr(_compositors, "compositor", None)
+    if compositor is None or compositor.box != timer_frames.box or compositor.buffer.shape != (HEIGHT, WIDTH, 3):
+        compositor = LapFrameCompositor((WIDTH, HEIGHT), timer_frames.box)
+        _compositors.compositor = compositor
+    return compositor
+
+def iter_lap_frames(lap_number, lap_time, timer_frames):
+    """
+    Lap frames with the lap label drawn once, only the timer box is rewritten
+    per frame. Each yielded frame is the worker's buffer, so it has to be
+    written (or copied) before asking for the next one.
+    """
+    compositor = get_lap_compositor(timer_frames)
+    compositor.set_lap(*create_lap_overlay_and_mask(lap_number))
+    last_idx = len(timer_frames) - 1
+
+    for f in range(lap_frame_count(lap_time)):
+        t = f / FPS
+        frame_idx = min(int(t * FPS), last_idx)
+        yield compositor.frame(timer_frames.patch(frame_idx))
 
 def render_lap_video(lap_number, lap_time, temp_dir, timer_frames):
     filename = os.path.join(temp_dir, f"lap_{lap_number:02}.mp4")
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     writer = cv2.VideoWriter(filename, fourcc, FPS, (WIDTH, HEIGHT))
 
-    lap_overlay, lap_mask = create_lap_overlay_and_mask(lap_number)
-
-    frame_count = math.floor(FPS * lap_time) + 1
-    for f in tqdm(range(frame_count), desc=f"Rendering Lap {lap_number}"):
-        t = f / FPS
-        frame = render_frame(lap_overlay, lap_mask, t, timer_frames)
+    frames = iter_lap_frames(lap_number, lap_time, timer_frames)
+    for frame in tqdm(frames, total=lap_frame_count(lap_time), desc=f"Rendering Lap {lap_number}"):
         writer.write(frame)
 
     writer.release()
     return filename
 
-
-def create_end_stats(duration, filename):
-    frame_count = int(duration * FPS)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    writer = cv2.VideoWriter(filename, fourcc, FPS, (WIDTH, HEIGHT), True)
-
+"""
+Process backend: timer patches are rendered once into shared memory and every
+worker maps them, instead of each lap task pickling its own copy. Every lap
+counts up from 0, so only the patches up to the longest lap are shared.
+"""
+_worker_shared = None
+_worker_timer_frames = None
+
+def init_lap_worker(patch_spec, box, overrides):
+    global _worker_shared, _worker_timer_frames
+    configure(**overrides)
+    if patch_spec is None:
+        # Over TIMER_CACHE_MB to share: this worker renders its own patches under its slice of the budget
+        _worker_timer_frames = get_timer_frame_source()
+        return
+    _worker_shared = SharedArray.attach(patch_spec)
+    _worker_timer_frames = PatchFrames(_worker_shared.array, box, (WIDTH, HEIGHT))
+
+def render_lap_video_shared(lap_number, lap_time, temp_dir):
+    return render_lap_video(lap_number, lap_time, temp_dir, _worker_timer_frames)
+
+def share_timer_frames(timer_frames, frame_count=None):
+    # The first frame_count patches (default all of them) in shared memory
+    frame_count = len(timer_frames) if frame_count is None else min(frame_count, len(timer_frames))
+    shared = SharedArray((frame_count,) + timer_frames.patch_shape, np.uint8)
+    timer_frames.render_patches(shared.array)
+    return shared
+
+def make_process_lap_executor(timer_frames, lap_time_sets, workers=None):
+    """
+    Process pool whose workers get their timer frames in init_lap_worker, and
+    the SharedArray they map (None when they render their own). Patches are
+    only shared if the ones the longest lap needs fit in TIMER_CACHE_MB,
+    otherwise each worker gets a TimerFrameSource with an even share of it.
+    """
+    longest = max((lap_frame_count(lap_time) for lap_times in lap_time_sets for lap_time in lap_times), default=1)
+    frame_count = min(longest, len(timer_frames))
+    if frame_count * timer_frames.patch_bytes <= TIMER_CACHE_MB * 1024 ** 2:
+        shared = share_timer_frames(timer_frames, frame_count)
+        initargs = (shared.spec(), timer_frames.box, _config_overrides)
+        return make_lap_executor("process", workers, init_lap_worker, initargs), shared
+
+    overrides = dict(_config_overrides, TIMER_CACHE_MB=TIMER_CACHE_MB / (workers or os.cpu_count() or 1))
+    return make_lap_executor("process", workers, init_lap_worker, (None, None, overrides)), None
+
+def render_laps_to_files(timer_frames, temp_dir, backend=None, workers=None, lap_times=None):
+    backend = backend or LAP_BACKEND
+    workers = workers or LAP_WORKERS
+    lap_times = LAP_TIMES if lap_times is None else lap_times
+
+    shared = None
+    if backend == "process":
+        executor, shared = make_process_lap_executor(timer_frames, [lap_times], workers)
+    else:
+        executor = make_lap_executor(backend, workers)
+
+    try:
+        with executor:
+            futures = {}
+            for i, lap_time in enumerate(lap_times):
+                if backend != "process":
+                    future = executor.submit(render_lap_video, i + 1, lap_time, temp_dir, timer_frames)
+                else:
+                    future = executor.submit(render_lap_video_shared, i + 1, lap_time, temp_dir)
+                futures[future] = i + 1
+
+            lap_videos = []
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Rendering laps in parallel"):
+                lap_videos.append(future.result())
+    finally:
+        if shared is not None:
+            shared.close()
+
+    # Sort videos by lap number (they can complete out of order)
+    lap_videos.sort(key=lambda x: int(os.path.basename(x).split('_')[1].split('.')[0]))
+    return lap_videos
+
+def benchmark_worker_scaling(worker_counts=(1, 2, 4, 8, 16)):
+    # Renders this race's laps with the process backend and reports frames/s per worker count
+    timer_frames = get_timer_frame_source()
+    frame_total = sum(lap_frame_count(lap_time) for lap_time in LAP_TIMES)
+
+    def run(workers):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            render_laps_to_files(timer_frames, temp_dir, backend="process", workers=workers)
+
+    return run_scaling_benchmark(run, frame_total, worker_counts)
+
+def stream_lap_frames(seq, lap_number, lap_time, timer_frames, reorder):
+    try:
+        for frame in iter_lap_frames(lap_number, lap_time, timer_frames):
+            reorder.put(seq, frame.copy())  # queued frames outlive the worker's buffer
+        reorder.finish(seq)
+    except BaseException as e:
+        reorder.fail(seq, e)
+        raise
+
+
+def create_end_stats_frame(lap_times=None):
     # Create a styled stats frame using PIL
     img = Image.new("RGB", (WIDTH, HEIGHT), (0, 0, 0))
     draw = ImageDraw.Draw(img)
-    draw_stats(draw)
-
-    frame_bgr = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
+    draw_stats(draw, lap_times)
 
-    for _ in range(frame_count):
-        writer.write(frame_bgr)
+    return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
 
-    writer.release()
+def create_end_stats(duration, segment_cache, lap_times=None):
+    # Encoded once from a single image, reruns with the same stats reuse the cached file
+    frame_bgr = create_end_stats_frame(lap_times)
+    return segment_cache.still_segment(frame_bgr, FPS, duration, use_gpu=USE_GPU)
 
 
-def draw_stats(draw):
-    avg = sum(LAP_TIMES) / len(LAP_TIMES)
-    best = min(LAP_TIMES)
-    worst = max(LAP_TIMES)
+def stats_lines(lap_times):
+    avg = sum(lap_times) / len(lap_times)
+    best = min(lap_times)
+    worst = max(lap_times)
     diff = worst - best
 
-    stats = [
+    return [
         f"Avg:   {avg:.3f} sec",
         f"Best:  {best:.3f} sec",
         f"Worst: {worst:.3f} sec",
         f"Δ:     {diff:.3f} sec"
     ]
 
-    draw_centered_text(draw, stats, TEXT_POSITIONS["stats"])
+def draw_stats(draw, lap_times=None):
+    draw_centered_text(draw, stats_lines(lap_times or LAP_TIMES), TEXT_POSITIONS["stats"])
 
 
 
-def create_blank_video(duration, filename):
+def create_end_stats_mp4v(duration, filename):
+    frame_bgr = create_end_stats_frame()
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    writer = cv2.VideoWriter(filename, fourcc, FPS, (WIDTH, HEIGHT))
-    blank = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
-    frame_count = int(FPS* duration)
-    for _ in range(frame_count):
-        writer.write(blank)
+    writer = cv2.VideoWriter(filename, fourcc, FPS, (WIDTH, HEIGHT), True)
+    for _ in range(int(duration * FPS)):
+        writer.write(frame_bgr)
     writer.release()
+    return filename
+
+
+def create_blank_video(duration, segment_cache):
+    blank = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    return segment_cache.still_segment(blank, FPS, duration, use_gpu=USE_GPU)
 
 
 
@@ -261,23 +462,272 @@ def concat_videos(file_list, output_file):
     subprocess.run(cmd, check=True)
 
 
+"""
+Streaming mode: every lap frame goes raw into one ffmpeg process in timeline order,
+so each frame is encoded once and nothing is written to a temp dir.
+Laps still render in parallel; the reorder buffer holds the ones that run ahead.
+"""
+def render_streaming(timer_frames, segment_cache):
+    reorder = ReorderBuffer(len(LAP_TIMES), max_frames=STREAM_QUEUE_FRAMES)
+    total_frames = sum(lap_frame_count(lap_time) for lap_time in LAP_TIMES)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        laps_file = os.path.join(temp_dir, "laps.mp4")
+        with FFmpegPipeWriter(laps_file, FPS, (WIDTH, HEIGHT), use_gpu=USE_GPU) as writer:
+            with ThreadPoolExecutor() as executor:
+                futures = [
+                    executor.submit(stream_lap_frames, i, i + 1, lap_time, timer_frames, reorder)
+                    for i, lap_time in enumerate(LAP_TIMES)
+                ]
+                try:
+                    for frame in tqdm(reorder, total=total_frames, desc="Encoding laps"):
+                        writer.write(frame)
+                except BaseException:
+                    reorder.cancel()
+                    raise
+
+                for future in futures:
+                    future.result()
+
+        print("Creating STATS")
+        end_stats = create_end_stats(END_DURATION, segment_cache)
+
+        # Laps and the cached stats segment share encoder settings, so this is a stream copy
+        concat_copy([laps_file, end_stats], OUTPUT_VIDEO_FILE)
+
+
+"""
+Render cache mode: every lap is its own final-codec segment stored under a
+fingerprint of its inputs. After a timing correction only the laps whose
+inputs changed are rendered again, the rest are joined back by stream copy.
+"""
+def lap_fingerprint(lap_number, lap_time):
+    return fingerprint(
+        "timer_lap", RENDER_VERSION, lap_number, lap_time,
+        file_fingerprint(FONT_PATH), FONT_SIZE, WIDTH, HEIGHT, FPS, MAX_TIME,
+        TEXT_POSITIONS, get_encoder_opts(USE_GPU),
+    )
+
+def lap_segment_key(lap_number, lap_time):
+    return f"timer_lap_{lap_fingerprint(lap_number, lap_time)}"
+
+def build_lap_segment(lap_number, lap_time, cache_dir, timer_frames=None):
+    # Pool task for a lap the caller already missed; process workers use their mapped timer frames
+    timer_frames = _worker_timer_frames if timer_frames is None else timer_frames
+
+    def render(temp_path):
+        with FFmpegPipeWriter(temp_path, FPS, (WIDTH, HEIGHT), use_gpu=USE_GPU) as writer:
+            for frame in iter_lap_frames(lap_number, lap_time, timer_frames):
+                writer.write(frame)
+
+    return SegmentCache(cache_dir).build(lap_segment_key(lap_number, lap_time), render)
+
+def lap_segment_workers(backend):
+    # Every worker runs its own encoder, so the process pool also defaults to the NVENC session cap
+    if backend == "process":
+        return LAP_WORKERS or SEGMENT_ENCODERS
+    return SEGMENT_ENCODERS
+
+def render_lap_segments(lap_time_sets, timer_frames, segment_cache, backend=None):
+    """
+    Cached lap segments for each list of lap times, in the same shape.
+    Hits are looked up here, only misses go to the LAP_BACKEND pool, and a
+    lap shared by several lists (same number and time) is rendered once.
+    """
+    backend = backend or LAP_BACKEND
+    keys = [[lap_segment_key(i + 1, lap_time) for i, lap_time in enumerate(lap_times)] for lap_times in lap_time_sets]
+    paths = {key: segment_cache.lookup(key) for key in dict.fromkeys(k for lap_keys in keys for k in lap_keys)}
+    missing = {}
+    for lap_times, lap_keys in zip(lap_time_sets, keys):
+        for i, key in enumerate(lap_keys):
+            if paths[key] is None:
+                missing.setdefault(key, (i + 1, lap_times[i]))
+
+    if missing:
+        shared = None
+        try:
+            if backend == "process":
+                missing_laps = [[lap_time for _, lap_time in missing.values()]]
+                executor, shared = make_process_lap_executor(timer_frames, missing_laps, lap_segment_workers(backend))
+                pool_frames = None
+            else:
+                executor = make_lap_executor(backend, lap_segment_workers(backend))
+                pool_frames = timer_frames
+            with executor:
+                futures = {
+                    key: executor.submit(build_lap_segment, lap_number, lap_time, segment_cache.cache_dir, pool_frames)
+                    for key, (lap_number, lap_time) in missing.items()
+                }
+                for key, future in tqdm(futures.items(), desc="Rendering changed laps"):
+                    paths[key] = future.result()
+        finally:
+            if shared is not None:
+                shared.close()
+
+    return [[paths[key] for key in lap_keys] for lap_keys in keys]
+
+def render_incremental(timer_frames, segment_cache):
+    lap_segments = render_lap_segments([LAP_TIMES], timer_frames, segment_cache)[0]
+
+    print("Creating STATS")
+    end_stats = create_end_stats(END_DURATION, segment_cache)
+    segment_cache.report("Render cache")
+
+    concat_copy(lap_segments + [end_stats], OUTPUT_VIDEO_FILE)
+
+
+"""
+Whole-field mode: the CSV is read once and every racer's laps go on one pool.
+Timer patches, glyphs and the segment cache are shared, so a lap segment only
+depends on (lap number, lap time) and is rendered once for the whole field.
+"""
+def render_field(csv_path=None, racers=None, output_pattern=None):
+    field = field_lap_times(get_field_times(csv_path or RACE_CSV), racers)
+    outputs = field_output_paths(output_pattern or FIELD_OUTPUT_PATTERN, field)
+    if AUTO_CANVAS:
+        fit_canvas(list(field.values()))  # one canvas for the whole field so lap segments stay shareable
+
+    timer_frames = get_timer_frame_source()
+    segment_cache = SegmentCache()
+    start = time.perf_counter()
+
+    lap_segment_sets = render_lap_segments(list(field.values()), timer_frames, segment_cache)
+    with ThreadPoolExecutor(max_workers=SEGMENT_ENCODERS) as executor:
+        # Stats stills encode in the background, racer N's concat runs while later stats render
+        stats = {racer: executor.submit(create_end_stats, END_DURATION, segment_cache, lap_times)
+                 for racer, lap_times in field.items()}
+        for (racer, stats_future), lap_segments in tqdm(zip(stats.items(), lap_segment_sets), total=len(stats), desc="Rendering field"):
+            concat_copy(lap_segments + [stats_future.result()], outputs[racer])
+
+    frame_total = sum(
+        sum(lap_frame_count(lap_time) for lap_time in lap_times) + int(END_DURATION * FPS)
+        for lap_times in field.values()
+    )
+    segment_cache.report("Render cache")
+    report_field_throughput(outputs, frame_total, time.perf_counter() - start)
+    return outputs
+
+
+"""
+Burn-in mode: decode footage -> draw lap label + timer at the race start offset -> encode,
+one generation, no black overlay video to composite later.
+Decode and encode run on their own threads behind bounded queues, so the
+whole thing runs at about the speed of the slowest stage (normally the encoder).
+"""
+def make_sprite(overlay):
+    """
+    Crops a black-background overlay to its drawn part: (x, y, pixels, alpha).
+    The text colours all have a 255 channel, so the brightest channel is the
+    anti-aliasing coverage and edges can be blended instead of hard-masked.
+    """
+    alpha = overlay.max(axis=2)
+    ys, xs = np.nonzero(alpha)
+    if len(xs) == 0:
+        return None
+    x0, x1, y0, y1 = xs.min(), xs.max() + 1, ys.min(), ys.max() + 1
+    return (x0, y0, overlay[y0:y1, x0:x1], alpha[y0:y1, x0:x1])
+
+def paste_sprite(frame, sprite, offset_x, offset_y):
+    if sprite is None:
+        return
+    x, y, pixels, alpha = sprite
+    x += offset_x
+    y += offset_y
+    h, w = alpha.shape
+    # Clip to the footage in case the canvas hangs off an edge
+    fx0, fy0 = max(x, 0), max(y, 0)
+    fx1, fy1 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+    if fx0 >= fx1 or fy0 >= fy1:
+        return
+    sx0, sy0 = fx0 - x, fy0 - y
+    sx1, sy1 = sx0 + (fx1 - fx0), sy0 + (fy1 - fy0)
+
+    roi = frame[fy0:fy1, fx0:fx1]
+    inv_alpha = 255 - alpha[sy0:sy1, sx0:sx1, None].astype(np.uint16)
+    # pixels are already colour * alpha, so this is a premultiplied "over"
+    roi[:] = pixels[sy0:sy1, sx0:sx1] + (roi * inv_alpha + 127) // 255
+
+def timer_sprite(timer_frames, idx):
+    x0, y0, _, _ = timer_frames.box
+    patch = timer_frames.patch(idx)
+    return (x0, y0, patch, patch.max(axis=2))
+
+def burn_in_lap_starts(fps):
+    # Footage frame each lap starts on (last entry = race end), placed by race time so any footage fps lines up
+    lap_edges = RACE_START_OFFSET + np.cumsum([0.0] + list(LAP_TIMES))
+    return np.round(lap_edges * fps).astype(np.int64)
+
+def burn_in(source, output_file):
+    timer_frames = get_timer_frame_source()
+    reader = PrefetchReader(source, max_frames=BURN_IN_QUEUE)
+    fps = reader.fps
+
+    lap_starts = burn_in_lap_starts(fps)
+    stats_end = lap_starts[-1] + int(END_DURATION * fps)
+    # Timer frames are FPS apart, footage frames fps apart; exactly 1 when they match
+    timer_step = FPS / fps
+
+    lap_labels = [make_sprite(create_lap_overlay(i + 1)) for i in range(len(LAP_TIMES))]
+    stats_sprite = make_sprite(create_end_stats_frame())
+    pos_x, pos_y = BURN_IN_POSITION
+
+    try:
+        # An error mid-way kills ffmpeg instead of finishing a truncated file
+        with QueuedWriter(
+            FFmpegPipeWriter(output_file, fps, reader.frame_size, use_gpu=USE_GPU, audio_source=source),
+            max_frames=BURN_IN_QUEUE,
+        ) as writer:
+            for idx, frame in enumerate(tqdm(reader, total=reader.frame_count, desc="Burning in timer")):
+                if lap_starts[0] <= idx < lap_starts[-1]:
+                    lap = np.searchsorted(lap_starts, idx, side="right") - 1
+                    timer_idx = min(int((idx - lap_starts[lap]) * timer_step), len(timer_frames) - 1)
+                    paste_sprite(frame, lap_labels[lap], pos_x, pos_y)
+                    paste_sprite(frame, timer_sprite(timer_frames, timer_idx), pos_x, pos_y)
+                elif lap_starts[-1] <= idx < stats_end:
+                    paste_sprite(frame, stats_sprite, pos_x, pos_y)
+                writer.write(frame)
+    finally:
+        reader.close()
+
+
 def main():
-    # rerender_input = input("Rerender: Timer Counter? [Y/n]: ")
-    # if rerender_input.strip().lower() in ('y', 'yes', ''):
-    generate_timer_video()
+    if not LAP_TIMES:
+        load_race()
+
+    if BURN_IN_SOURCE:
+        if LAP_BACKEND != "thread":
+            print(f"⚠️ LAP_BACKEND={LAP_BACKEND!r} has no effect on burn-in, it is one decode/draw/encode pipeline")
+        burn_in(BURN_IN_SOURCE, BURN_IN_OUTPUT)
+        print(f"✅ Burned-in footage saved as {BURN_IN_OUTPUT}")
+        return
+
+    if AUTO_CANVAS:
+        fit_canvas()
+    text_metrics.report("Text layout")
 
     # Setup once
-    timer_frames = preload_timer_frames()
+    timer_frames = get_timer_frame_source()
+    segment_cache = SegmentCache()
+
+    if RENDER_CACHE:
+        render_incremental(timer_frames, segment_cache)
+        print(f"✅ Timer Overlay Video saved as {OUTPUT_VIDEO_FILE}")
+        return
+
+    # Frames can't stream back out of worker processes, so the process backend uses per-lap files
+    if STREAM_ENCODE and LAP_BACKEND == "thread":
+        render_streaming(timer_frames, segment_cache)
+        print(f"✅ Timer Overlay Video saved as {OUTPUT_VIDEO_FILE}")
+        return
 
     with tempfile.TemporaryDirectory() as temp_dir:
         # 1. Create start blank video
-        start_blank = os.path.join(temp_dir, "start_blank.mp4")
         print("Creating Blank")
-        create_blank_video(START_DURATION, start_blank)
+        start_blank = create_blank_video(START_DURATION, segment_cache)
 
-        end_stats = os.path.join(temp_dir, "end_stats.mp4")
+        # Lap files here are mp4v, the concat demuxer needs the stats in the same codec
         print("Creating STATS")
-        create_end_stats(END_DURATION, end_stats)
+        end_stats = create_end_stats_mp4v(END_DURATION, os.path.join(temp_dir, "end_stats.mp4"))
 
         # 2. Render laps in parallel
         lap_videos = []
@@ -287,20 +737,7 @@ def main():
             lap_video = render_lap_video(1, LAP_TIMES[1], temp_dir, timer_frames)
             lap_videos.append(lap_video)
         else:
-            with ThreadPoolExecutor() as executor:
-                futures = {
-                            executor.submit(render_lap_video, i + 1, lap_time, temp_dir, timer_frames): i + 1
-                            for i, lap_time in enumerate(LAP_TIMES)
-                        }
-
-                for future in tqdm(as_completed(futures), total=len(futures), desc="Rendering laps in parallel"):
-                    lap_number = futures[future]
-                    lap_videos.append(future.result())
-
-
-
-        # Sort videos by lap number (they can complete out of order)
-        lap_videos.sort(key=lambda x: int(os.path.basename(x).split('_')[1].split('.')[0]))
+            lap_videos = render_laps_to_files(timer_frames, temp_dir)
 
         # 3. Concatenate all videos: start_blank + lap videos
         concat_videos(lap_videos + [end_stats], OUTPUT_VIDEO_FILE)
@@ -314,42 +751,7 @@ def main():
 #     # cProfile.run('main()')
 
 
-from PyQt6.QtWidgets import QApplication, QPushButton, QVBoxLayout, QWidget, QLabel
-from PyQt6.QtCore import Qt
-import sys
-
-
-
-class TimerOverlayApp(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Timer Overlay Generator")
-        self.setGeometry(100, 100, 400, 200)
-
-        self.label = QLabel("Click to generate timer overlay", self)
-        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        self.button = QPushButton("Generate Timer Overlay", self)
-        self.button.clicked.connect(self.run_overlay_generation)
-
-        layout = QVBoxLayout()
-        layout.addWidget(self.label)
-        layout.addWidget(self.button)
-        self.setLayout(layout)
-
-    def run_overlay_generation(self):
-        self.label.setText("Generating... Please wait.")
-        self.button.setEnabled(False)
-        try:
-            main()
-            self.label.setText("✅ Done. Overlay saved.")
-        except Exception as e:
-            self.label.setText(f"❌ Error: {str(e)}")
-        finally:
-            self.button.setEnabled(True)
-
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = TimerOverlayApp()
-    window.show()
-    sys.exit(app.exec())
+    # Qt only gets imported for the GUI, the headless entry point is python -m MakeTimerOverlay
+    from MakeTimerOverlay.timer_overlay_gui import run_gui
+    run_gui()
@@ -0,0 +1,58 @@
+import sys
+import time
+
+from OverlayShared.cli import add_lap_backend_arguments, build_parser, common_overrides, lap_backend_overrides
+
+"""
+python -m MakeTimerOverlay --csv race.csv --racer "EpicX18 GT9" -o Timer.mp4
+python -m MakeTimerOverlay --csv race.csv --all-racers -o "Timer_{racer}.mp4"
+"""
+
+
+def main(argv=None):
+    parser = build_parser("python -m MakeTimerOverlay", "Render the lap timer overlay.")
+    parser.add_argument("--burn-in", metavar="FOOTAGE", help="draw the timer straight onto this footage")
+    parser.add_argument("--race-start", type=float, help="seconds into the footage where lap 1 starts")
+    parser.add_argument("--all-racers", action="store_true", help="one overlay per racer in the CSV, -o is a pattern with {racer}")
+    add_lap_backend_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        from MakeTimerOverlay.timer_overlay_gui import run_gui
+        run_gui()
+        return
+
+    # Heavy imports only once the arguments are known to be good
+    from MakeTimerOverlay import TimerOverlay_v5 as overlay
+
+    if args.all_racers:
+        output_setting = "FIELD_OUTPUT_PATTERN"
+    elif args.burn_in:
+        output_setting = "BURN_IN_OUTPUT"
+    else:
+        output_setting = "OUTPUT_VIDEO_FILE"
+    overrides = common_overrides(args, output_setting)
+    overrides.update(lap_backend_overrides(args))
+    if args.burn_in:
+        overrides["BURN_IN_SOURCE"] = args.burn_in
+    if args.race_start is not None:
+        overrides["RACE_START_OFFSET"] = args.race_start
+    overlay.configure(**overrides)
+
+    if args.all_racers:
+        try:
+            overlay.render_field(args.csv)
+        except ValueError as e:
+            # Output pattern without {racer} or racers whose files would collide
+            sys.exit(f"❌ {e}")
+        return
+
+    start = time.perf_counter()
+    if not overlay.load_race(args.csv, args.racer):
+        sys.exit("❌ No lap times found for that racer")
+    overlay.main()
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class TimerFrameSource:
+    """
+    Count-up timer frames computed on demand, replacing the old
+    generate timer_temp.mp4 -> decode everything into a list round trip.
+
+    Only the timer text box changes between frames, so the cache holds those
+    small patches (LRU, capped at max_bytes) and full frames are rebuilt from
+    them. Indexing works like the old list: len(source), source[idx].
+    """
+
+    def __init__(self, atlas, frame_count, text_for, frame_size, x, y, max_bytes=256 * 1024 ** 2, batch=64):
+        self.atlas = atlas
+        self.frame_count = frame_count
+        self.text_for = text_for
+        self.width, self.height = frame_size
+        self.x = x
+        self.y = y
+        self.max_bytes = max_bytes
+        self.batch = batch
+
+        self.box = self._text_box()
+        x0, y0, x1, y1 = self.box
+        self.patch_shape = (y1 - y0, x1 - x0, 3)
+        self.patch_bytes = int(np.prod(self.patch_shape))
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _text_box(self):
+        # Union of every timer string's cells, clipped to the canvas
+        atlas = self.atlas
+        x0, x1 = self.width, 0
+        for idx in range(self.frame_count):
+            text = self.text_for(idx)
+            origin = atlas.centered_origin_x(text, self.x)
+            _, pens = atlas.layout(text)
+            x0 = min(x0, origin + pens[0] - atlas.pad)
+            x1 = max(x1, origin + pens[-1] - atlas.pad + atlas.cell_width)
+        y0 = self.y + atlas.top
+        y1 = y0 + atlas.height
+        return max(0, x0), max(0, y0), min(self.width, x1), min(self.height, y1)
+
+    def __len__(self):
+        return self.frame_count
+
+    def _render_block(self, start):
+        stop = min(start + self.batch, self.frame_count)
+        x0, y0, _, _ = self.box
+        texts = [self.text_for(idx) for idx in range(start, stop)]
+        patches = np.zeros((len(texts),) + self.patch_shape, dtype=np.uint8)
+        self.atlas.draw_centered_batch(patches, texts, self.x - x0, self.y - y0)
+        return {start + i: patch for i, patch in enumerate(patches)}
+
+    def patch(self, idx):
+        with self._lock:
+            patch = self._cache.get(idx)
+            if patch is not None:
+                self._cache.move_to_end(idx)
+                self.hits += 1
+                return patch
+            self.misses += 1
+
+        # Render a whole block outside the lock, the next frames are usually wanted next
+        block = self._render_block(idx - idx % self.batch)
+        with self._lock:
+            for i, p in block.items():
+                self._cache[i] = p
+            while len(self._cache) * self.patch_bytes > self.max_bytes and len(self._cache) > 1:
+                self._cache.popitem(last=False)
+        return block[idx]
+
+    def __getitem__(self, idx):
+        # Returns a new frame every call, callers are free to draw on it
+        x0, y0, x1, y1 = self.box
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        frame[y0:y1, x0:x1] = self.patch(idx)
+        return frame
+
+    def render_patches(self, out):
+        # Fills out (n, *patch_shape) with the first n patches, e.g. a shared memory array for worker processes
+        x0, y0, _, _ = self.box
+        for start in range(0, len(out), self.batch):
+            stop = min(start + self.batch, len(out))
+            texts = [self.text_for(idx) for idx in range(start, stop)]
+            out[start:stop] = 0
+            self.atlas.draw_centered_batch(out[start:stop], texts, self.x - x0, self.y - y0)
+        return out
+
+
+class PatchFrames:
+    """
+    Timer frames backed by patches that were all rendered up front,
+    e.g. TimerFrameSource.render_patches() into shared memory.
+    Same len()/[] interface as TimerFrameSource.
+    """
+
+    def __init__(self, patches, box, frame_size):
+        self.patches = patches
+        self.box = box
+        self.width, self.height = frame_size
+
+    def __len__(self):
+        return len(self.patches)
+
+    def patch(self, idx):
+        return self.patches[idx]
+
+    def __getitem__(self, idx):
+        x0, y0, x1, y1 = self.box
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        frame[y0:y1, x0:x1] = self.patches[idx]
+        return frame
+
+
+class LapFrameCompositor:
+    """
+    One persistent frame buffer, meant to be kept per worker thread.
+    The lap label is written when the lap changes, after that each frame only
+    rewrites the timer box (plus any label pixels that sit inside it) instead
+    of building a whole new frame and masking the label over all of it.
+
+    frame() returns the buffer itself, it is only valid until the next call.
+    """
+
+    def __init__(self, frame_size, box):
+        width, height = frame_size
+        self.buffer = np.zeros((height, width, 3), dtype=np.uint8)
+        self.box = box
+        self.label_rect = None
+        self.overlap = None
+
+    def set_lap(self, overlay, mask):
+        # overlay is black wherever mask is 0, so copying its bounding rect is exact
+        if self.label_rect is not None:
+            x, y, w, h = self.label_rect
+            self.buffer[y:y + h, x:x + w] = 0
+
+        x, y, w, h = cv2.boundingRect(mask)
+        self.label_rect = (x, y, w, h) if w and h else None
+        self.overlap = None
+        if self.label_rect is None:
+            return
+        self.buffer[y:y + h, x:x + w] = overlay[y:y + h, x:x + w]
+
+        # Label pixels inside the timer box have to go back on top after every timer write
+        bx0, by0, bx1, by1 = self.box
+        ox0, oy0 = max(x, bx0), max(y, by0)
+        ox1, oy1 = min(x + w, bx1), min(y + h, by1)
+        if ox0 < ox1 and oy0 < oy1:
+            region = (slice(oy0, oy1), slice(ox0, ox1))
+            self.overlap = (region, overlay[region].copy(), (mask[region] > 0)[..., None])
+
+    def frame(self, patch):
+        x0, y0, x1, y1 = self.box
+        self.buffer[y0:y1, x0:x1] = patch
+        if self.overlap is not None:
+            region, pixels, where = self.overlap
+            np.copyto(self.buffer[region], pixels, where=where)
+        return self.buffer
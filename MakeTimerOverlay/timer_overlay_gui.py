@@ -0,0 +1,42 @@
+import sys
+
+from PyQt6.QtWidgets import QApplication, QPushButton, QVBoxLayout, QWidget, QLabel
+from PyQt6.QtCore import Qt
+
+from MakeTimerOverlay import TimerOverlay_v5
+
+
+class TimerOverlayApp(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Timer Overlay Generator")
+        self.setGeometry(100, 100, 400, 200)
+
+        self.label = QLabel("Click to generate timer overlay", self)
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.button = QPushButton("Generate Timer Overlay", self)
+        self.button.clicked.connect(self.run_overlay_generation)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.label)
+        layout.addWidget(self.button)
+        self.setLayout(layout)
+
+    def run_overlay_generation(self):
+        self.label.setText("Generating... Please wait.")
+        self.button.setEnabled(False)
+        try:
+            TimerOverlay_v5.main()
+            self.label.setText("✅ Done. Overlay saved.")
+        except Exception as e:
+            self.label.setText(f"❌ Error: {str(e)}")
+        finally:
+            self.button.setEnabled(True)
+
+
+def run_gui():
+    app = QApplication(sys.argv)
+    window = TimerOverlayApp()
+    window.show()
+    sys.exit(app.exec())
@@ -0,0 +1,58 @@
+"""
+Shrinking overlay canvases to what actually gets drawn.
+Boxes are (x0, y0, x1, y1) with x1/y1 exclusive.
+"""
+
+
+def align_up(n, multiple):
+    return -(-n // multiple) * multiple
+
+
+def union_box(boxes):
+    boxes = list(boxes)
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+def text_ink_box(font, text, x, y):
+    # Where draw.text((x, y), text, font=font) puts ink
+    left, top, right, bottom = font.getbbox(text)
+    return (x + left, y + top, x + right, y + bottom)
+
+
+def fit_box(content, canvas_size, pad, align):
+    """
+    Returns (x0, y0, width, height): content padded by pad, sized up to a
+    multiple of align and kept inside the original canvas where it fits.
+    """
+    canvas_w, canvas_h = canvas_size
+
+    def fit_axis(lo, hi, limit):
+        lo = max(0, lo - pad)
+        hi = min(limit, hi + pad)
+        size = min(align_up(hi - lo, align), align_up(limit, 2))
+        lo = max(0, min(lo, limit - size))
+        return lo, size
+
+    x0, width = fit_axis(content[0], content[2], canvas_w)
+    y0, height = fit_axis(content[1], content[3], canvas_h)
+    return x0, y0, width, height
+
+
+def report_canvas(label, old_size, new_size, offset=(0, 0)):
+    old_px = old_size[0] * old_size[1]
+    new_px = new_size[0] * new_size[1]
+    # Fitting can also grow a canvas (e.g. fit_columns widening the table)
+    change = new_px / old_px - 1
+    if change > 0:
+        ratio = f"{change:.0%} more pixels per frame"
+    elif change < 0:
+        ratio = f"{-change:.0%} fewer pixels per frame"
+    else:
+        ratio = "same pixels per frame"
+    print(f"{label} canvas {old_size[0]}x{old_size[1]} -> {new_size[0]}x{new_size[1]} "
+          f"({ratio}), top-left at {offset} of the old layout")
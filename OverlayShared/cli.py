@@ -0,0 +1,44 @@
+import argparse
+
+"""
+Shared argument parsing for the python -m entry points.
+Kept free of numpy/cv2/PIL/Qt imports so --help and bad arguments come back instantly.
+"""
+
+
+def build_parser(prog, description):
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument("--csv", help="race lap_times CSV (defaults to the module's RACE_CSV)")
+    parser.add_argument("--racer", help="racer column in the CSV (defaults to the module's RACER)")
+    parser.add_argument("--fps", type=float, help="output frame rate")
+    parser.add_argument("-o", "--output", help="output video file")
+    parser.add_argument("--cpu", action="store_true", help="encode with libx264 instead of NVENC")
+    parser.add_argument("--gui", action="store_true", help="open the Qt window instead of rendering headless")
+    return parser
+
+
+def add_lap_backend_arguments(parser):
+    # Timer and table only, the segment overlay has no per-lap pool
+    parser.add_argument("--lap-backend", choices=["thread", "process"], help="render laps on threads (default) or worker processes")
+    parser.add_argument("--workers", type=int, help="lap workers for the process backend")
+
+
+def lap_backend_overrides(args):
+    overrides = {}
+    if args.lap_backend:
+        overrides["LAP_BACKEND"] = args.lap_backend
+    if args.workers:
+        overrides["LAP_WORKERS"] = args.workers
+    return overrides
+
+
+def common_overrides(args, output_setting):
+    # Maps the shared flags onto the module's config constants
+    overrides = {}
+    if args.fps is not None:
+        overrides["FPS"] = args.fps
+    if args.output:
+        overrides[output_setting] = args.output
+    if args.cpu:
+        overrides["USE_GPU"] = False
+    return overrides
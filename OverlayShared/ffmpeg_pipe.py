@@ -0,0 +1,244 @@
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+
+import cv2
+
+FFMPEG_BIN = "ffmpeg"  # Change if you need an absolute path
+
+
+def get_encoder_opts(use_gpu):
+    if use_gpu:
+        return [
+            "-c:v", "h264_nvenc",
+            "-preset", "fast",   # NVENC presets
+            "-rc", "vbr",
+            "-cq", "18"
+        ]
+    return [
+        "-c:v", "libx264",
+        "-crf", "18",
+        "-preset", "slow"
+    ]
+
+
+def concat_line(path):
+    # ffconcat quoting: close the quote, escape the apostrophe, reopen
+    path = os.path.abspath(path).replace("'", "'\\''")
+    return f"file '{path}'\n"
+
+
+def concat_copy(file_list, output_file):
+    """
+    Joins segments that were encoded with the same settings (get_encoder_opts,
+    yuv420p, same fps/size) by stream copy, nothing is re-encoded.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        for file in file_list:
+            f.write(concat_line(file))
+        concat_txt = f.name
+
+    cmd = [
+        FFMPEG_BIN,
+        "-y",
+        "-loglevel", "error",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", concat_txt,
+        "-c", "copy",
+        output_file
+    ]
+    try:
+        subprocess.run(cmd, check=True)
+    finally:
+        os.remove(concat_txt)
+
+
+def encode_still(frame, fps, frame_count, filename, use_gpu=True):
+    # One raw frame in, ffmpeg's loop filter holds it for frame_count CFR frames
+    height, width = frame.shape[:2]
+    cmd = [
+        FFMPEG_BIN,
+        "-y",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "bgr24",
+        "-s", f"{width}x{height}",
+        "-r", str(fps),
+        "-i", "-",
+        "-vf", "loop=loop=-1:size=1",
+        "-frames:v", str(frame_count),
+        *get_encoder_opts(use_gpu),
+        "-fps_mode", "cfr",
+        "-r", str(fps),
+        "-pix_fmt", "yuv420p",
+        filename
+    ]
+    subprocess.run(cmd, input=frame.tobytes(), check=True)
+
+
+def write_timeline_list(events, fps, frame_total, temp_dir):
+    """
+    Writes each event image to temp_dir once and returns an ffconcat list
+    that holds it until the next event. events is [(start_frame, frame_bgr), ...]
+    sorted by start_frame, starting at 0. Each boundary sits half a frame
+    after its start frame, in the middle of the window where -fps_mode cfr
+    (or the fps filter with round=down) puts the change on exactly that frame.
+    """
+    list_file = os.path.join(temp_dir, "timeline.ffconcat")
+    with open(list_file, "w") as f:
+        f.write("ffconcat version 1.0\n")
+        bounds = [0.0] + [(start + 0.5) / fps for start, _ in events[1:]] + [frame_total / fps]
+        for i, (start, frame) in enumerate(events):
+            image = os.path.join(temp_dir, f"event_{i:05}.png")
+            cv2.imwrite(image, frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+            f.write(concat_line(image))
+            # Fine image timebase, the default 1/25 s would round boundaries by up to 2 frames
+            f.write("option framerate 100000\n")
+            f.write(f"duration {bounds[i + 1] - bounds[i]:.6f}\n")
+        # The demuxer ignores the last entry's duration unless the file is listed again
+        f.write(concat_line(image))
+        f.write("option framerate 100000\n")
+    return list_file
+
+
+def encode_timeline(events, fps, frame_total, filename, use_gpu=True):
+    """
+    Encodes a video that only changes at a few known frames.
+    Each image is written once and held until the next event by the concat
+    demuxer's durations (write_timeline_list), then -fps_mode cfr lays it
+    out on the fps grid.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        list_file = write_timeline_list(events, fps, frame_total, temp_dir)
+
+        cmd = [
+            FFMPEG_BIN,
+            "-y",
+            "-loglevel", "error",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", list_file,
+            *get_encoder_opts(use_gpu),
+            "-fps_mode", "cfr",
+            "-r", str(fps),
+            "-frames:v", str(frame_total),
+            "-pix_fmt", "yuv420p",
+            filename
+        ]
+        subprocess.run(cmd, check=True)
+
+
+class FFmpegPipeWriter:
+    """
+    One long-lived ffmpeg process that takes raw BGR frames on stdin.
+    Has the same write()/release() calls as cv2.VideoWriter so the render
+    code can feed either one, but every frame is only encoded once.
+    """
+
+    def __init__(self, filename, fps, frame_size, use_gpu=True, pix_fmt="bgr24", audio_source=None):
+        width, height = frame_size
+        self.filename = filename
+        cmd = [
+            FFMPEG_BIN,
+            "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", pix_fmt,
+            "-s", f"{width}x{height}",
+            "-r", str(fps),
+            "-i", "-",
+        ]
+        if audio_source:
+            # Carry the source footage's audio over untouched
+            cmd += ["-i", audio_source, "-map", "0:v", "-map", "1:a?", "-c:a", "copy"]
+        cmd += [
+            *get_encoder_opts(use_gpu),
+            "-fps_mode", "cfr",
+            "-r", str(fps),
+            "-pix_fmt", "yuv420p",
+            filename
+        ]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        # Contiguous frames go straight from the numpy buffer, no extra copy
+        self.proc.stdin.write(frame.data if frame.flags.c_contiguous else frame.tobytes())
+
+    def release(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        returncode = self.proc.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self.proc.args)
+
+    def kill(self):
+        # Don't leave a half-written file looking finished
+        self.proc.kill()
+        self.proc.wait()
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass  # ffmpeg is gone, nothing left to flush to
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.release()
+        else:
+            self.kill()
+
+
+class ReorderBuffer:
+    """
+    Sits in front of the encoder when laps render in parallel.
+    Each lap (seq) gets its own small bounded queue; iterating the buffer
+    drains seq 0, then seq 1, ... so frames come out in timeline order.
+    Workers ahead of the encoder block once their queue is full, which keeps
+    memory at roughly workers * max_frames frames.
+    """
+
+    _END = object()
+
+    def __init__(self, count, max_frames=120):
+        self._queues = [queue.Queue(maxsize=max_frames) for _ in range(count)]
+        self._cancelled = threading.Event()
+
+    def put(self, seq, frame):
+        q = self._queues[seq]
+        while True:
+            if self._cancelled.is_set():
+                raise RuntimeError("Reorder buffer was cancelled")
+            try:
+                q.put(frame, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self, seq):
+        self.put(seq, self._END)
+
+    def fail(self, seq, exc):
+        # Wakes the consumer up with the worker's error instead of hanging it
+        try:
+            self.put(seq, exc)
+        except RuntimeError:
+            pass  # already cancelled, nobody is reading
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def __iter__(self):
+        for q in self._queues:
+            while True:
+                item = q.get()
+                if item is self._END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
@@ -0,0 +1,50 @@
+import os
+import re
+
+"""
+Helpers for rendering one overlay per racer from a single lap_times CSV.
+"""
+
+
+def racer_output_path(pattern, racer):
+    # Racer names come from the timing system, keep them filesystem safe
+    if "{racer}" not in pattern:
+        raise ValueError(f"Output pattern needs a {{racer}} placeholder: {pattern}")
+    safe = re.sub(r'[^\w\-. ]+', '_', racer).strip() or "racer"
+    return pattern.format(racer=safe)
+
+
+def field_output_paths(pattern, racers):
+    """
+    {racer: output path} for the whole field, checked before anything is
+    rendered: names that clean up to the same file would overwrite each other.
+    """
+    outputs = {racer: racer_output_path(pattern, racer) for racer in racers}
+    claimed = {}
+    for racer, path in outputs.items():
+        claimed.setdefault(os.path.normcase(os.path.abspath(path)), []).append(racer)
+    clashes = [" / ".join(names) for names in claimed.values() if len(names) > 1]
+    if clashes:
+        raise ValueError(f"Racers would share an output file: {'; '.join(clashes)}")
+    return outputs
+
+
+def field_lap_times(field, racers=None):
+    """
+    Drops blank laps and racers with no laps from get_field_times() output,
+    optionally keeping only the named racers.
+    """
+    if racers:
+        missing = [racer for racer in racers if racer not in field]
+        if missing:
+            raise ValueError(f"Racers not in CSV: {', '.join(missing)}")
+        field = {racer: field[racer] for racer in racers}
+    field = {racer: [t for t in times if t is not None] for racer, times in field.items()}
+    return {racer: times for racer, times in field.items() if times}
+
+
+def report_field_throughput(outputs, frame_total, elapsed):
+    print(f"{len(outputs)} racers, {frame_total} frames in {elapsed:.1f}s "
+          f"({frame_total / max(elapsed, 1e-9):.1f} frames/s, {elapsed / max(len(outputs), 1):.1f}s per racer)")
+    for racer, path in outputs.items():
+        print(f"  {racer}: {os.path.abspath(path)}")
@@ -0,0 +1,95 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+class GlyphAtlas:
+    """
+    Rasterizes a fixed character set once with PIL and keeps every glyph as a
+    pre-coloured BGR cell in one numpy array. Strings are then assembled from
+    slice copies, so FreeType only runs len(chars) times total.
+
+    Positions follow PIL's draw.text: (x, y) is the text origin, not the ink box.
+    """
+
+    def __init__(self, font, chars, fill):
+        self.chars = chars
+        self.index = {c: i for i, c in enumerate(chars)}
+
+        boxes = [font.getbbox(c) for c in chars]
+        self.advances = [font.getlength(c) for c in chars]
+        self.bbox_left = [b[0] for b in boxes]
+        self.bbox_right = [b[2] for b in boxes]
+
+        self.top = min(b[1] for b in boxes)
+        bottom = max(b[3] for b in boxes)
+        self.height = bottom - self.top
+        self.pad = max(0, -min(self.bbox_left))
+        self.cell_width = self.pad + max(max(b[2] for b in boxes), int(np.ceil(max(self.advances))))
+
+        alpha = np.zeros((len(chars), self.height, self.cell_width), dtype=np.uint8)
+        for i, c in enumerate(chars):
+            img = Image.new("L", (self.cell_width, self.height), 0)
+            ImageDraw.Draw(img).text((self.pad, -self.top), c, font=font, fill=255)
+            alpha[i] = np.array(img)
+
+        # Colour once, the same way PIL blends anti-aliased text onto black
+        color = np.array(fill[::-1], dtype=np.uint32)  # RGB fill -> BGR
+        self.cells = ((alpha[..., None].astype(np.uint32) * color + 127) // 255).astype(np.uint8)
+
+    def layout(self, text):
+        # Glyph indices and integer pen positions relative to the text origin
+        glyphs = [self.index[c] for c in text]
+        pens = []
+        pen = 0.0
+        for g in glyphs:
+            pens.append(int(round(pen)))
+            pen += self.advances[g]
+        return glyphs, pens
+
+    def ink_width(self, text):
+        glyphs, pens = self.layout(text)
+        if not glyphs:
+            return 0
+        return (pens[-1] + self.bbox_right[glyphs[-1]]) - (pens[0] + self.bbox_left[glyphs[0]])
+
+    def centered_origin_x(self, text, x):
+        # Same centering as draw_centered_text: x - text_w // 2
+        return x - self.ink_width(text) // 2
+
+    def draw(self, canvas, text, x, y):
+        glyphs, pens = self.layout(text)
+        row = y + self.top
+        for g, pen in zip(glyphs, pens):
+            col = x + pen - self.pad
+            region = canvas[row:row + self.height, col:col + self.cell_width]
+            np.maximum(region, self.cells[g], out=region)
+
+    def draw_centered(self, canvas, text, x, y):
+        self.draw(canvas, text, self.centered_origin_x(text, x), y)
+
+    def draw_centered_batch(self, canvases, texts, x, y):
+        """
+        Draws texts[i] into canvases[i] for a whole batch at once.
+        Strings that share a layout (same length for digits) are blitted
+        together, one vectorized slice op per character slot.
+        """
+        groups = {}
+        for i, text in enumerate(texts):
+            origin = self.centered_origin_x(text, x)
+            glyphs, pens = self.layout(text)
+            key = (origin, tuple(pens))
+            groups.setdefault(key, ([], []))
+            groups[key][0].append(i)
+            groups[key][1].append(glyphs)
+
+        row = y + self.top
+        for (origin, pens), (frame_idx, glyphs) in groups.items():
+            frame_idx = np.array(frame_idx)
+            glyphs = np.array(glyphs)
+            for slot, pen in enumerate(pens):
+                col = origin + pen - self.pad
+                rows = slice(row, row + self.height)
+                cols = slice(col, col + self.cell_width)
+                canvases[frame_idx, rows, cols] = np.maximum(
+                    canvases[frame_idx, rows, cols], self.cells[glyphs[:, slot]]
+                )
@@ -0,0 +1,36 @@
+from functools import lru_cache
+
+from PIL import ImageFont
+
+from GatherRaceTimes.anaylsis_of_a_racers_times import get_racer_times
+
+"""
+What every overlay module does the same way: config overrides by name,
+reading one racer's laps from a lap_times CSV and loading fonts.
+"""
+
+
+def apply_overrides(settings, overrides, applied=None):
+    """
+    Sets config constants in settings (a module's globals()) by name.
+    Only existing UPPERCASE names are accepted, so a typo fails instead of
+    adding a setting nothing reads. applied collects the overrides so they
+    can be handed on to process-pool workers.
+    """
+    unknown = [name for name in overrides if not name.isupper() or name not in settings]
+    if unknown:
+        raise ValueError(f"Unknown setting: {', '.join(unknown)}")
+    settings.update(overrides)
+    if applied is not None:
+        applied.update(overrides)
+
+
+def racer_lap_times(csv_path, racer):
+    # Laps the racer ran, blank cells dropped; [] when the racer isn't in the CSV
+    return [t for t in get_racer_times(csv_path, racer) if t is not None]
+
+
+@lru_cache(maxsize=None)
+def load_font(path, size):
+    # One load per (path, size), so a FONT_PATH changed through configure() gets its own entry
+    return ImageFont.truetype(path, size)
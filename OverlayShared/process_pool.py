@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def make_lap_executor(backend="thread", workers=None, initializer=None, initargs=()):
+    """
+    "thread" is the old behaviour. "process" gets around the GIL for the
+    per-frame Python work; the initializer runs once in every worker.
+    """
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    if backend == "thread":
+        if initializer is not None:
+            initializer(*initargs)
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown lap backend: {backend}")
+
+
+def completed_future(value):
+    # Stands in for a pool task that didn't need to run (e.g. a cache hit)
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class SharedArray:
+    """
+    numpy array living in multiprocessing.shared_memory.
+    The parent creates it, workers attach() by spec() so big read-only inputs
+    are mapped instead of pickled once per task.
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        self.owner = name is None
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        # Pool workers share the parent's resource tracker, only the owner unlinks in close()
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+
+    @classmethod
+    def from_array(cls, arr):
+        shared = cls(arr.shape, arr.dtype)
+        shared.array[...] = arr
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def spec(self):
+        return (self.shm.name, self.array.shape, self.array.dtype.str)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_scaling_benchmark(run, frame_total, worker_counts=(1, 2, 4, 8, 16)):
+    """
+    run(workers) renders the same workload with that many workers.
+    Prints and returns frames/s for each worker count.
+    """
+    results = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        run(workers)
+        elapsed = time.perf_counter() - start
+        results[workers] = frame_total / elapsed
+
+    base = results[worker_counts[0]]
+    print(f"{'workers':>8} {'frames/s':>10} {'speedup':>8}")
+    for workers, fps in results.items():
+        print(f"{workers:>8} {fps:>10.1f} {fps / base:>7.2f}x")
+    return results
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import uuid
+
+from OverlayShared.ffmpeg_pipe import encode_still, get_encoder_opts
+
+SEGMENT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".overlay_cache", "segments")
+
+
+def fingerprint(*parts):
+    # Stable key for a segment's inputs (numbers, strings, tuples of those)
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def file_fingerprint(path):
+    # Font/CSV identity without hashing the whole file every run
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path,)
+    return (os.path.abspath(path), st.st_size, int(st.st_mtime))
+
+
+class SegmentCache:
+    """
+    Encoded segments kept on disk under a hash of everything that decides
+    their pixels: frame content, resolution, fps, frame count and codec opts.
+    Cached files are in the final codec so they can be joined by stream copy.
+    """
+
+    def __init__(self, cache_dir=SEGMENT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def temp_path_for(self, key):
+        # Written here first and renamed in, so a killed render never leaves a bad hit
+        return os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex}.part.mp4")
+
+    def lookup(self, key):
+        path = self.path_for(key)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def store(self, key, temp_path):
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        return path
+
+    def segment(self, key, render):
+        """
+        Returns the cached file for key, calling render(temp_path) to make it on a miss.
+        """
+        path = self.lookup(key)
+        if path is not None:
+            return path
+        return self.build(key, render)
+
+    def build(self, key, render):
+        # Renders key without looking it up first, for pool tasks whose caller already missed
+        temp_path = self.temp_path_for(key)
+        try:
+            render(temp_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return self.store(key, temp_path)
+
+    def report(self, label):
+        print(f"{label}: {self.hits} reused, {self.misses} rendered")
+
+    def still_segment(self, frame_bgr, fps, duration, use_gpu=True):
+        frame_count = int(duration * fps)
+        height, width = frame_bgr.shape[:2]
+
+        h = hashlib.sha256()
+        h.update(frame_bgr.tobytes())
+        h.update(f"{width}x{height}|{fps}|{frame_count}|{' '.join(get_encoder_opts(use_gpu))}".encode())
+        key = f"still_{h.hexdigest()}"
+
+        return self.segment(key, lambda temp_path: encode_still(frame_bgr, fps, frame_count, temp_path, use_gpu=use_gpu))
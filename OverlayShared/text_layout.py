@@ -0,0 +1,68 @@
+from collections import namedtuple
+from functools import lru_cache
+
+"""
+Text measuring and table geometry worked out once, ahead of the render loop.
+Centering a string the overlay has drawn before is a cache lookup instead of
+another font.getbbox() call.
+"""
+
+
+class TextMetrics:
+    """
+    font.getbbox() per (text, font size), kept in an LRU.
+    get_font(font_size) is the overlay's own font loader.
+    """
+
+    def __init__(self, get_font, maxsize=8192):
+        self.get_font = get_font
+        self.bbox = lru_cache(maxsize=maxsize)(self._measure)
+
+    def _measure(self, text, font_size):
+        return self.get_font(font_size).getbbox(text)
+
+    def width(self, text, font_size):
+        left, _, right, _ = self.bbox(text, font_size)
+        return right - left
+
+    def ink_box(self, text, font_size, x, y):
+        # Where draw.text((x, y), text) puts ink, same as canvas_fit.text_ink_box
+        left, top, right, bottom = self.bbox(text, font_size)
+        return (x + left, y + top, x + right, y + bottom)
+
+    def centered_origin(self, text, font_size, x, y):
+        # draw.text() origin that centers the ink box on (x, y), as the table overlay always has
+        left, top, right, bottom = self.bbox(text, font_size)
+        return int(x - (right - left) / 2), int(y - (bottom - top) / 2)
+
+    def clear(self):
+        # Call after changing the font file, cached sizes belong to the old one
+        self.bbox.cache_clear()
+
+    def hit_rate(self):
+        info = self.bbox.cache_info()
+        total = info.hits + info.misses
+        return info.hits / total if total else 0.0
+
+    def report(self, label):
+        info = self.bbox.cache_info()
+        print(f"{label}: {info.misses} strings measured, {info.hits} reused ({self.hit_rate():.0%} hit rate)")
+
+
+TableLayout = namedtuple("TableLayout", "row_h header_size row_size col_centers col_lines")
+
+
+@lru_cache(maxsize=256)
+def table_layout(x, row_h, col_widths, header_scale=0.8, row_scale=0.7):
+    """
+    Font sizes and column positions for a table at x with rows row_h tall.
+    col_widths must be a tuple; the layout only changes when it or row_h does.
+    """
+    centers = []
+    lines = []
+    col_x = x
+    for width in col_widths:
+        centers.append(col_x + width // 2)
+        col_x += width
+        lines.append(col_x)
+    return TableLayout(row_h, int(row_h * header_scale), int(row_h * row_scale), tuple(centers), tuple(lines[:-1]))
@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from OverlayShared.text_layout import TextMetrics
+
+
+class TextSpriteCache:
+    """
+    Each (text, font size) is rasterized once into an alpha sprite and then
+    blended straight into BGR numpy frames, so drawing a string no longer
+    round-trips the whole frame through PIL.
+
+    The blend is PIL's own (DIV255 of bg*(255-a) + fill*a), so the result is
+    the same as draw.text on the RGB image.
+    Measuring goes through metrics (a TextMetrics), shared with the overlay's
+    own layout code so each string is only measured once.
+    """
+
+    def __init__(self, get_font, metrics=None):
+        self.get_font = get_font
+        self.metrics = metrics or TextMetrics(get_font)
+        self._sprites = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def sprite(self, text, font_size):
+        # (left, top, alpha): alpha's top-left sits at draw origin + (left, top)
+        key = (text, font_size)
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self.hits += 1
+                return sprite
+            self.misses += 1
+
+        font = self.get_font(font_size)
+        left, top, right, bottom = self.metrics.bbox(text, font_size)
+        img = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(img).text((-left, -top), text, font=font, fill=255)
+        sprite = (left, top, np.array(img, dtype=np.uint32))
+
+        with self._lock:
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, img, text, x, y, font_size, color):
+        # Same placement as draw.text((x, y), text) on the frame
+        left, top, alpha = self.sprite(text, font_size)
+        x0, y0 = x + left, y + top
+        height, width = alpha.shape
+
+        # Clip to the frame
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        sx1 = min(width, img.shape[1] - x0)
+        sy1 = min(height, img.shape[0] - y0)
+        if sx0 >= sx1 or sy0 >= sy1:
+            return img
+
+        a = alpha[sy0:sy1, sx0:sx1, None]
+        region = img[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1]
+        fill = np.array(color[::-1], dtype=np.uint32)  # RGB -> BGR
+        tmp = region * (255 - a) + fill * a + 128
+        region[...] = ((tmp >> 8) + tmp) >> 8
+        return img
+
+    def draw_centered(self, img, text, x, y, font_size, color):
+        # Same centering as draw_centered_text_pil
+        x, y = self.metrics.centered_origin(text, font_size, x, y)
+        return self.draw(img, text, x, y, font_size, color)
@@ -0,0 +1,131 @@
+import queue
+import threading
+
+import cv2
+
+
+class PrefetchReader:
+    """
+    Decodes a video on a background thread into a bounded queue, so decoding
+    the next frames overlaps with drawing/encoding the current one.
+    """
+
+    _END = object()
+
+    def __init__(self, source, max_frames=32):
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise FileNotFoundError(f"Could not open video: {source}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_size = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        self._queue = queue.Queue(maxsize=max_frames)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                if not self._put(frame):
+                    return
+            self._put(self._END)
+        except BaseException as e:
+            self._put(e)
+        finally:
+            self.cap.release()
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is self._END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class QueuedWriter:
+    """
+    Hands frames to writer.write() on a background thread through a bounded
+    queue, so the encoder pipe write overlaps with the next frame's drawing.
+    Frames must not be modified after write().
+    """
+
+    _END = object()
+
+    def __init__(self, writer, max_frames=32):
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=max_frames)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._END:
+                return
+            if self._error is not None:
+                continue  # keep draining so write() never blocks forever
+            try:
+                self.writer.write(item)
+            except BaseException as e:
+                self._error = e
+
+    def write(self, frame):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+
+    def release(self):
+        self._queue.put(self._END)
+        self._thread.join()
+        if self._error is not None:
+            try:
+                self.writer.release()
+            except Exception:
+                pass  # the original write error is the useful one
+            raise self._error
+        self.writer.release()
+
+    def abort(self):
+        # Drops what is still queued; writers with kill() (FFmpegPipeWriter) are killed, not finished
+        if self._error is None:
+            self._error = RuntimeError("Writer was aborted")
+        if hasattr(self.writer, "kill"):
+            self.writer.kill()
+        self._queue.put(self._END)
+        self._thread.join()
+        if not hasattr(self.writer, "kill"):
+            self.writer.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.release()
+        else:
+            self.abort()
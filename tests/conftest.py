@@ -0,0 +1,29 @@
+import csv
+import os
+import sys
+
+import pytest
+
+# Overlay modules import each other as packages from the repo root (python -m MakeXOverlay)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def race_csv(tmp_path):
+    """
+    write(laps_by_racer) -> path of a lap_times CSV in the RaceStorage layout:
+    a Lap column then one column per racer, blank cells for laps not run.
+    """
+    def write(laps_by_racer):
+        path = tmp_path / "lap_times.csv"
+        lap_count = max(len(laps) for laps in laps_by_racer.values())
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Lap", *laps_by_racer])
+            for lap in range(lap_count):
+                row = [lap + 1]
+                for laps in laps_by_racer.values():
+                    row.append(f"{laps[lap]:.3f}" if lap < len(laps) else "")
+                writer.writerow(row)
+        return str(path)
+    return write
@@ -0,0 +1,11 @@
+from OverlayShared.canvas_fit import report_canvas
+
+
+def test_report_canvas_words_growth_and_shrink(capsys):
+    report_canvas("Table", (100, 100), (50, 100))
+    report_canvas("Table", (100, 100), (164, 100))
+    report_canvas("Table", (100, 100), (50, 200))
+    lines = capsys.readouterr().out.splitlines()
+    assert "(50% fewer pixels per frame)" in lines[0]
+    assert "(64% more pixels per frame)" in lines[1]
+    assert "(same pixels per frame)" in lines[2]
@@ -0,0 +1,42 @@
+import importlib
+
+import pytest
+
+from OverlayShared.overlay_config import apply_overrides
+
+
+@pytest.mark.parametrize("package", ["MakeTableOverlay", "MakeTimerOverlay", "MakeSegmentOverlay"])
+def test_unknown_racer_exits_cleanly(package, race_csv):
+    csv_path = race_csv({"EpicX18 GT9": [31.2, 30.8]})
+    main = importlib.import_module(f"{package}.__main__").main
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--csv", csv_path, "--racer", "Nobody", "--cpu"])
+    assert "No lap times found" in str(exit_info.value.code)
+
+
+def test_apply_overrides_rejects_unknown_settings_without_applying_any():
+    settings = {"FPS": 59.94, "USE_GPU": True}
+    applied = {}
+    with pytest.raises(ValueError, match="FSP"):
+        apply_overrides(settings, {"USE_GPU": False, "FSP": 30}, applied)
+    assert settings == {"FPS": 59.94, "USE_GPU": True}
+    assert applied == {}
+
+    apply_overrides(settings, {"FPS": 30}, applied)
+    assert settings["FPS"] == 30
+    assert applied == {"FPS": 30}
+
+
+@pytest.mark.parametrize("package", ["MakeTableOverlay", "MakeTimerOverlay"])
+def test_lap_backend_flags_reach_the_overlay(package, race_csv, monkeypatch):
+    csv_path = race_csv({"EpicX18 GT9": [31.2, 30.8]})
+    main = importlib.import_module(f"{package}.__main__").main
+    overlay = importlib.import_module(f"{package}.{package[4:]}_v5")
+    for name in ("LAP_BACKEND", "LAP_WORKERS", "USE_GPU", "LAP_TIMES", "TOTAL_ROWS", "FRAME_HEIGHT"):
+        if hasattr(overlay, name):
+            monkeypatch.setattr(overlay, name, getattr(overlay, name))
+    monkeypatch.setattr(overlay, "_config_overrides", {})
+    monkeypatch.setattr(overlay, "main", lambda: None)
+
+    main(["--csv", csv_path, "--racer", "EpicX18 GT9", "--cpu", "--lap-backend", "process", "--workers", "3"])
+    assert (overlay.LAP_BACKEND, overlay.LAP_WORKERS) == ("process", 3)
@@ -0,0 +1,37 @@
+import importlib
+
+import pytest
+
+from GatherRaceTimes.anaylsis_of_a_racers_times import get_field_times, get_racer_times
+from OverlayShared.field_batch import field_output_paths, racer_output_path
+
+
+def test_racer_output_path_needs_racer_placeholder():
+    assert racer_output_path("out/Timer_{racer}.mp4", "Third/One") == "out/Timer_Third_One.mp4"
+    with pytest.raises(ValueError, match="placeholder"):
+        racer_output_path("out/Timer.mp4", "Third/One")
+
+
+def test_field_output_paths_rejects_names_that_clean_to_the_same_file():
+    outputs = field_output_paths("Timer_{racer}.mp4", ["EpicX18 GT9", "Other Guy"])
+    assert outputs == {"EpicX18 GT9": "Timer_EpicX18 GT9.mp4", "Other Guy": "Timer_Other Guy.mp4"}
+    with pytest.raises(ValueError, match="Third/One / Third:One"):
+        field_output_paths("Timer_{racer}.mp4", ["Third/One", "Other Guy", "Third:One"])
+
+
+def test_racer_and_field_times_parse_cells_the_same_way(tmp_path):
+    path = tmp_path / "lap_times.csv"
+    path.write_text("Lap,A,B\n1,31.200, 30.8 \n2,,DNF\n3,29.5,\n")
+    field = get_field_times(str(path))
+    assert field == {"A": [31.2, None, 29.5], "B": [30.8, None, None]}
+    assert [get_racer_times(str(path), racer) for racer in field] == list(field.values())
+
+
+@pytest.mark.parametrize("package", ["MakeTableOverlay", "MakeTimerOverlay"])
+def test_all_racers_with_clashing_outputs_exits_before_rendering(package, race_csv, tmp_path):
+    csv_path = race_csv({"Third/One": [31.2], "Third:One": [30.8]})
+    main = importlib.import_module(f"{package}.__main__").main
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--csv", csv_path, "--all-racers", "--cpu", "-o", str(tmp_path / "out_{racer}.mp4")])
+    assert "share an output file" in str(exit_info.value.code)
+    assert not list(tmp_path.glob("out_*"))
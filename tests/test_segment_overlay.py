@@ -0,0 +1,129 @@
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+from PIL import ImageFont
+
+from MakeSegmentOverlay import SegmentOverlay_v1 as seg
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not on PATH")
+
+
+@pytest.fixture
+def small_overlay(monkeypatch):
+    # Small, CPU-encoded overlay with PIL's built-in font; restored after each test
+    for name, value in {"WIDTH": 400, "HEIGHT": 40, "FPS": 30, "USE_GPU": False, "END_DURATION": 0.5}.items():
+        monkeypatch.setattr(seg, name, value)
+    monkeypatch.setattr(seg, "FONT", ImageFont.load_default())
+    monkeypatch.setattr(seg, "LAP_TIMES", [])
+
+
+def decode_frames(path):
+    cmd = [seg.FFMPEG_BIN, "-loglevel", "error", "-i", path, "-f", "rawvideo", "-pix_fmt", "bgr24", "-"]
+    raw = subprocess.run(cmd, check=True, capture_output=True).stdout
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, seg.HEIGHT, seg.WIDTH, 3)
+
+
+def playhead_expr_depth(expr):
+    depth = deepest = 0
+    for char in expr:
+        depth += (char == "(") - (char == ")")
+        deepest = max(deepest, depth)
+    return deepest
+
+
+def test_playhead_expr_nesting_grows_with_log_of_laps(small_overlay):
+    seg.LAP_TIMES = [1.0] * 100
+    depth_100 = playhead_expr_depth(seg.playhead_expr())
+    seg.LAP_TIMES = [1.0] * 1000
+    depth_1000 = playhead_expr_depth(seg.playhead_expr())
+    assert depth_1000 - depth_100 <= 4
+
+
+@needs_ffmpeg
+def test_filtergraph_renders_100_lap_race_like_composite(small_overlay, race_csv, tmp_path):
+    laps = list(np.random.default_rng(7).uniform(0.08, 0.15, size=100).round(3))
+    seg.load_race(race_csv({"Racer": laps}), "Racer")
+    assert len(seg.LAP_TIMES) == 100
+
+    filtergraph_file = str(tmp_path / "filtergraph.mp4")
+    composite_file = str(tmp_path / "composite.mp4")
+    seg.render_segment_filtergraph(filtergraph_file)
+    seg.render_segment_overlay(composite_file)
+
+    frame_count = int(seg.FPS * (sum(seg.LAP_TIMES) + seg.END_DURATION))
+    filtergraph_frames = decode_frames(filtergraph_file)
+    composite_frames = decode_frames(composite_file)
+    assert len(filtergraph_frames) == frame_count
+    assert np.array_equal(filtergraph_frames, composite_frames)
+
+
+def loop_alignment(lap_times, width, fps):
+    """
+    The per-frame loop test_alignment() used before it was vectorized:
+    (dot_x, seg_start, seg_end) for every frame of the race.
+    """
+    total_time = sum(lap_times)
+    segment_length = [(lap / total_time) * width for lap in lap_times]
+    lap_cumulative_times = np.cumsum(lap_times)
+    frames = []
+    for frame_idx in range(int(fps * total_time)):
+        current_time_sec = frame_idx / fps
+        lap_done_idx = np.searchsorted(lap_cumulative_times, current_time_sec, side='right')
+
+        accum_length = 0
+        for i, lap_time in enumerate(lap_times):
+            start_time = sum(lap_times[:i])
+            end_time = start_time + lap_time
+            if current_time_sec <= end_time:
+                segment_progress = (current_time_sec - start_time) / lap_time if lap_time > 0 else 0
+                dot_x = int(accum_length + segment_progress * segment_length[i])
+                break
+            accum_length += segment_length[i]
+        else:
+            dot_x = width - 1
+
+        if lap_done_idx == len(lap_times):
+            lap_done_idx -= 1
+        seg_start = int(sum(segment_length[:lap_done_idx]))
+        seg_end = int(sum(segment_length[:lap_done_idx + 1]))
+        frames.append((dot_x, seg_start, seg_end))
+    return np.array(frames, dtype=np.int64).reshape(-1, 3)
+
+
+def random_lap_sets(count=20, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        lap_count = int(rng.integers(1, 40))
+        yield list(np.round(rng.uniform(20.0, 60.0, lap_count), 3))
+
+
+@pytest.mark.parametrize("width", [400, 1920])
+def test_random_races_have_no_misaligned_frames(small_overlay, monkeypatch, width):
+    monkeypatch.setattr(seg, "WIDTH", width)
+    for lap_times in random_lap_sets():
+        seg.LAP_TIMES = lap_times
+        frames, dot_x, seg_start, seg_end = seg.alignment_errors()
+        assert len(frames) == 0, f"{lap_times}: frame {frames[0]} x={dot_x[0]} outside [{seg_start[0]}, {seg_end[0]}]"
+
+
+def test_vectorized_alignment_matches_the_old_loop(small_overlay, monkeypatch):
+    real_playhead_x = seg.playhead_x
+    for lap_times in random_lap_sets(count=8, seed=1):
+        seg.LAP_TIMES = lap_times
+        reference = loop_alignment(lap_times, seg.WIDTH, seg.FPS)
+        times = np.arange(len(reference)) / seg.FPS
+        assert np.array_equal(real_playhead_x(times), reference[:, 0])
+
+        # Push the playhead off by a few pixels so there is something to find, both checks must flag the same frames
+        monkeypatch.setattr(seg, "playhead_x", lambda t: real_playhead_x(t) + 3)
+        dot_x, seg_start, seg_end = (reference[:, 0] + 3), reference[:, 1], reference[:, 2]
+        expected = np.flatnonzero((dot_x < seg_start) | (dot_x > seg_end))
+        frames, bad_x, bad_start, bad_end = seg.alignment_errors()
+        assert len(expected) > 0
+        assert np.array_equal(frames, expected)
+        assert np.array_equal(bad_x, dot_x[expected])
+        assert np.array_equal(bad_start, seg_start[expected])
+        assert np.array_equal(bad_end, seg_end[expected])
+        monkeypatch.setattr(seg, "playhead_x", real_playhead_x)
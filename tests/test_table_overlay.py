@@ -0,0 +1,82 @@
+import shutil
+import subprocess
+
+import pytest
+from PIL import ImageFont
+
+from MakeTableOverlay import TableOverlay_v5 as table
+from OverlayShared import ffmpeg_pipe
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not on PATH")
+
+
+@pytest.fixture
+def table_overlay(monkeypatch):
+    # CPU encoding and PIL's bundled font, at a low frame rate to keep the stills short
+    monkeypatch.setattr(table, "USE_GPU", False)
+    monkeypatch.setattr(table, "FPS", 30)
+    monkeypatch.setattr(table, "END_DURATION", 0.2)
+    monkeypatch.setattr(table, "load_font", lambda path, size: ImageFont.load_default(size=size))
+    for name in ("LAP_TIMES", "TOTAL_ROWS", "HEADERS", "FRAME_HEIGHT", "COL_WIDTHS", "TABLE_WIDTH", "FRAME_WIDTH"):
+        monkeypatch.setattr(table, name, getattr(table, name))
+    monkeypatch.setattr(table, "_config_overrides", {})
+    table.text_metrics.clear()
+    yield
+    table.text_metrics.clear()
+
+
+def decoded_md5(path):
+    cmd = [ffmpeg_pipe.FFMPEG_BIN, "-loglevel", "error", "-i", str(path), "-f", "md5", "-"]
+    return subprocess.run(cmd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@needs_ffmpeg
+def test_render_cache_uses_lap_backend(table_overlay, monkeypatch, tmp_path):
+    table.set_lap_times(table.best_lap_deltas([0.3, 0.4, 0.35]))
+    table.fit_columns()
+
+    backends = []
+    real_make_lap_executor = table.make_lap_executor
+    def recording_executor(backend, *args, **kwargs):
+        backends.append(backend)
+        return real_make_lap_executor(backend, *args, **kwargs)
+    monkeypatch.setattr(table, "make_lap_executor", recording_executor)
+
+    outputs = {}
+    for backend in ("thread", "process"):
+        monkeypatch.setattr(table, "LAP_BACKEND", backend)
+        monkeypatch.setattr(table, "OUTPUT_VIDEO_FILE", str(tmp_path / f"{backend}.mp4"))
+        table.render_incremental(table.SegmentCache(str(tmp_path / f"cache_{backend}")))
+        outputs[backend] = decoded_md5(table.OUTPUT_VIDEO_FILE)
+    assert backends == ["thread", "process"]
+    assert outputs["process"] == outputs["thread"]
+
+    # A rerun only looks the tables up
+    segment_cache = table.SegmentCache(str(tmp_path / "cache_process"))
+    table.render_incremental(segment_cache)
+    assert (segment_cache.hits, segment_cache.misses) == (4, 0)
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("auto_columns", [True, False])
+def test_standings_leave_the_lap_table_layout_alone(table_overlay, monkeypatch, race_csv, tmp_path, auto_columns):
+    monkeypatch.setattr(table, "AUTO_COLUMNS", auto_columns)
+    csv_path = race_csv({"EpicX18 GT9": [0.3, 0.4, 0.35], "Other Guy": [0.32, 0.41, 0.3]})
+    table.load_race(csv_path, "EpicX18 GT9")
+    if auto_columns:
+        table.fit_columns()
+
+    def render_table(name):
+        monkeypatch.setattr(table, "OUTPUT_VIDEO_FILE", str(tmp_path / f"{name}.mp4"))
+        table.render_incremental(table.SegmentCache(str(tmp_path / f"cache_{name}")))
+        return decoded_md5(table.OUTPUT_VIDEO_FILE)
+
+    layout = {name: getattr(table, name) for name in table.STANDINGS_LAYOUT}
+    overrides = dict(table._config_overrides)
+    before = render_table("before")
+
+    table.render_standings(csv_path, "EpicX18 GT9", str(tmp_path / "standings.mp4"))
+    assert {name: getattr(table, name) for name in table.STANDINGS_LAYOUT} == layout
+    assert table._config_overrides == overrides
+
+    assert render_table("after") == before
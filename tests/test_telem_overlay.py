@@ -0,0 +1,42 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(REPO_ROOT, "MakeTelemOverlay", "telem_overlay.py")
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not on PATH")
+
+
+def write_gpx(path, points=20):
+    trkpts = "".join(
+        f'<trkpt lat="0" lon="0"><time>2025-06-20T10:00:{i // 10:02d}.{i % 10}00Z</time>'
+        f'<extensions><gpxacc:accel x="{0.1 * (i % 5):.1f}" y="0.2" z="1.0"/></extensions></trkpt>'
+        for i in range(points)
+    )
+    path.write_text(
+        '<?xml version="1.0"?><gpx xmlns="http://www.topografix.com/GPX/1/1" '
+        'xmlns:gpxacc="http://www.garmin.com/xmlschemas/AccelerationExtension/v1">'
+        f"<trk><trkseg>{trkpts}</trkseg></trk></gpx>"
+    )
+    return str(path)
+
+
+def test_script_imports_from_outside_the_repo(tmp_path):
+    # Same as python MakeTelemOverlay/telem_overlay.py up to the GUI, run from somewhere else
+    code = f"import runpy; runpy.run_path({SCRIPT!r}, run_name='telem_script')"
+    env = dict(os.environ, PYTHONPATH="")
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+@needs_ffmpeg
+def test_module_entry_point_renders_gpx_headless(tmp_path):
+    gpx_file = write_gpx(tmp_path / "session.gpx")
+    result = subprocess.run([sys.executable, "-m", "MakeTelemOverlay", gpx_file, "--fps", "10"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "session_telem_overlay.mp4").stat().st_size > 0
@@ -0,0 +1,163 @@
+import shutil
+import subprocess
+
+import pytest
+from PIL import ImageFont
+
+from MakeTimerOverlay import TimerOverlay_v5 as timer
+from OverlayShared import ffmpeg_pipe
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not on PATH")
+
+
+@pytest.fixture
+def timer_overlay(monkeypatch):
+    # CPU encoding and PIL's bundled font; the glyph and text caches start empty each test
+    monkeypatch.setattr(timer, "USE_GPU", False)
+    monkeypatch.setattr(timer, "FONT", ImageFont.load_default(size=timer.FONT_SIZE))
+    monkeypatch.setattr(timer, "_timer_atlas", None)
+    monkeypatch.setattr(timer, "LAP_TIMES", [])
+    timer.text_metrics.clear()
+    yield
+    timer.text_metrics.clear()
+
+
+def make_footage(path, fps, seconds, size="160x120"):
+    cmd = [
+        ffmpeg_pipe.FFMPEG_BIN,
+        "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate={fps}:duration={seconds}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        str(path),
+    ]
+    subprocess.run(cmd, check=True)
+    return str(path)
+
+
+def test_burn_in_laps_follow_race_time_at_any_footage_fps(timer_overlay, monkeypatch):
+    monkeypatch.setattr(timer, "LAP_TIMES", [2.0, 1.5])
+    monkeypatch.setattr(timer, "RACE_START_OFFSET", 1.0)
+    for fps in (29.97, 59.94, 120.0):
+        starts = timer.burn_in_lap_starts(fps)
+        assert list(starts) == [round(1.0 * fps), round(3.0 * fps), round(4.5 * fps)]
+
+
+@needs_ffmpeg
+def test_burn_in_timer_runs_in_real_time_on_lower_fps_footage(timer_overlay, monkeypatch, tmp_path):
+    source = make_footage(tmp_path / "source.mp4", "30000/1001", 3)
+    monkeypatch.setattr(timer, "FPS", 60)
+    monkeypatch.setattr(timer, "LAP_TIMES", [2.0])
+    monkeypatch.setattr(timer, "END_DURATION", 0.5)
+
+    shown = []
+    real_timer_sprite = timer.timer_sprite
+    def record(timer_frames, idx):
+        shown.append(idx)
+        return real_timer_sprite(timer_frames, idx)
+    monkeypatch.setattr(timer, "timer_sprite", record)
+
+    timer.burn_in(source, str(tmp_path / "burned.mp4"))
+
+    # 2.0 s of 29.97 fps footage is 60 frames, the timer moves 60/29.97 timer frames per footage frame
+    assert len(shown) == 60
+    assert shown[0] == 0
+    assert shown[-1] == int(59 * 60 / 29.97)
+    assert shown[-1] / timer.FPS == pytest.approx(59 / 29.97, abs=1 / 60)
+
+
+@needs_ffmpeg
+def test_burn_in_error_kills_encoder(timer_overlay, monkeypatch, tmp_path):
+    source = make_footage(tmp_path / "source.mp4", 30, 2)
+    monkeypatch.setattr(timer, "LAP_TIMES", [1.0])
+
+    writers = []
+    class RecordingWriter(ffmpeg_pipe.FFmpegPipeWriter):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            writers.append(self)
+    monkeypatch.setattr(timer, "FFmpegPipeWriter", RecordingWriter)
+
+    calls = []
+    def paste_then_fail(frame, sprite, x, y):
+        calls.append(1)
+        if len(calls) > 10:
+            raise RuntimeError("draw failed")
+    monkeypatch.setattr(timer, "paste_sprite", paste_then_fail)
+
+    with pytest.raises(RuntimeError, match="draw failed"):
+        timer.burn_in(source, str(tmp_path / "burned.mp4"))
+    assert len(writers) == 1
+    assert writers[0].proc.returncode is not None
+    assert writers[0].proc.returncode != 0
+
+
+def decoded_md5(path):
+    cmd = [ffmpeg_pipe.FFMPEG_BIN, "-loglevel", "error", "-i", str(path), "-f", "md5", "-"]
+    return subprocess.run(cmd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@needs_ffmpeg
+def test_render_cache_uses_lap_backend(timer_overlay, monkeypatch, tmp_path):
+    monkeypatch.setattr(timer, "FPS", 30)
+    monkeypatch.setattr(timer, "END_DURATION", 0.2)
+    monkeypatch.setattr(timer, "LAP_TIMES", [0.3, 0.4, 0.3])
+
+    backends = []
+    real_make_lap_executor = timer.make_lap_executor
+    def recording_executor(backend, *args, **kwargs):
+        backends.append(backend)
+        return real_make_lap_executor(backend, *args, **kwargs)
+    monkeypatch.setattr(timer, "make_lap_executor", recording_executor)
+
+    outputs = {}
+    for backend in ("thread", "process"):
+        monkeypatch.setattr(timer, "LAP_BACKEND", backend)
+        monkeypatch.setattr(timer, "OUTPUT_VIDEO_FILE", str(tmp_path / f"{backend}.mp4"))
+        segment_cache = timer.SegmentCache(str(tmp_path / f"cache_{backend}"))
+        timer.render_incremental(timer.get_timer_frame_source(), segment_cache)
+        outputs[backend] = decoded_md5(timer.OUTPUT_VIDEO_FILE)
+    assert backends == ["thread", "process"]
+    assert outputs["process"] == outputs["thread"]
+
+    # Nothing changed: every lap is a hit and no pool is started
+    segment_cache = timer.SegmentCache(str(tmp_path / "cache_process"))
+    timer.render_incremental(timer.get_timer_frame_source(), segment_cache)
+    assert backends == ["thread", "process"]
+    assert (segment_cache.hits, segment_cache.misses) == (4, 0)
+
+
+@needs_ffmpeg
+def test_process_backend_keeps_shared_patches_within_timer_cache_budget(timer_overlay, monkeypatch, tmp_path):
+    monkeypatch.setattr(timer, "FPS", 30)
+    monkeypatch.setattr(timer, "END_DURATION", 0.2)
+    monkeypatch.setattr(timer, "LAP_TIMES", [0.3, 0.5, 0.4])
+    monkeypatch.setattr(timer, "LAP_WORKERS", 2)
+
+    shared_counts = []
+    real_share_timer_frames = timer.share_timer_frames
+    def recording_share(timer_frames, frame_count=None):
+        shared = real_share_timer_frames(timer_frames, frame_count)
+        shared_counts.append(len(shared.array))
+        return shared
+    monkeypatch.setattr(timer, "share_timer_frames", recording_share)
+
+    def render(backend, budget_mb):
+        monkeypatch.setattr(timer, "LAP_BACKEND", backend)
+        monkeypatch.setattr(timer, "TIMER_CACHE_MB", budget_mb)
+        monkeypatch.setattr(timer, "OUTPUT_VIDEO_FILE", str(tmp_path / f"{backend}_{budget_mb}.mp4"))
+        segment_cache = timer.SegmentCache(str(tmp_path / f"cache_{backend}_{budget_mb}"))
+        timer.render_incremental(timer.get_timer_frame_source(), segment_cache)
+        return decoded_md5(timer.OUTPUT_VIDEO_FILE)
+
+    expected = render("thread", 256)
+
+    # Only the longest lap's patches are shared, not all MAX_TIME of them
+    assert render("process", 256) == expected
+    assert shared_counts == [timer.lap_frame_count(0.5)]
+    assert shared_counts[0] < len(timer.get_timer_frame_source())
+
+    # Over budget nothing is shared, each worker renders its own patches
+    timer_frames = timer.get_timer_frame_source()
+    tiny_mb = (timer.lap_frame_count(0.5) - 1) * timer_frames.patch_bytes / 1024 ** 2
+    assert render("process", tiny_mb) == expected
+    assert shared_counts == [timer.lap_frame_count(0.5)]